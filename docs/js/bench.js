@@ -0,0 +1,140 @@
+/**
+ * Benchmark de la tabla virtualizada y del worker de datos (docs/bench.html)
+ *
+ * Compara, para 1k, 26k y 100k filas (o las de ?n=, ej: bench.html?n=100000):
+ *   - parseo del JSON en el hilo principal (lo que ahora hace el worker)
+ *   - clonar todas las filas (lo que costaba recibirlas del worker) frente
+ *     a clonar solo el resumen y pedir las filas de una ventana
+ *   - orden y filtro en el worker (ida y vuelta, y tiempo dentro del worker)
+ *   - render inicial y scroll de la tabla virtual (filas pedidas al worker)
+ *   - render completo con un solo innerHTML (enfoque anterior)
+ */
+
+// Cada tamaño puede medirse en su propia carga de página: el render completo
+// de 100k filas tras los demás tamaños puede agotar el proceso de render
+const TAMANOS = (new URLSearchParams(location.search).get('n') || '1000,26000,100000')
+    .split(',').map(Number);
+const SALTOS_SCROLL = 50;
+
+/**
+ * Replica las votaciones reales hasta n filas, con Ids únicos
+ */
+function sintetizarFilas(base, n) {
+    const filas = new Array(n);
+    for (let i = 0; i < n; i++) {
+        const v = base[i % base.length];
+        filas[i] = { ...v, Id: `${v.Id}-${Math.floor(i / base.length)}` };
+    }
+    return filas;
+}
+
+function medir(fn) {
+    const inicio = performance.now();
+    fn();
+    return performance.now() - inicio;
+}
+
+async function medirAsync(fn) {
+    const inicio = performance.now();
+    await fn();
+    return performance.now() - inicio;
+}
+
+async function medirVista(mensaje) {
+    const inicio = performance.now();
+    const respuesta = await llamarWorker({ tipo: 'vista', ...mensaje });
+    return { total: performance.now() - inicio, worker: respuesta.duracion, vista: respuesta.vista };
+}
+
+async function ejecutarBenchmark() {
+    const salida = document.getElementById('resultados');
+    const datos = await (await fetch('data/votaciones.json')).json();
+    const base = datos.votaciones;
+
+    workerDatos = crearWorkerDatos();
+    const contenedor = document.getElementById('bench-contenedor');
+    const tbodyVirtual = document.getElementById('bench-virtual');
+    const tbodyCompleta = document.getElementById('bench-completa');
+    const tabla = new TablaVirtual(contenedor, tbodyVirtual, {
+        renderizarFila: filaVotacionHTML,
+        obtenerFilas: obtenerFilasTabla,
+        columnas: CAMPOS_TABLA.length
+    });
+
+    const filasResultado = [];
+    for (const n of TAMANOS) {
+        const filas = sintetizarFilas(base, n);
+        const json = JSON.stringify({ votaciones: filas });
+
+        const r = { filas: n };
+        r.parseoPrincipal = medir(() => JSON.parse(json));
+        r.clonFilas = medir(() => structuredClone(filas));
+        r.clonResumen = medir(() => structuredClone(resumirVotaciones(filas)));
+        r.envioWorker = await (async () => {
+            const inicio = performance.now();
+            await llamarWorker({ tipo: 'filas', votaciones: filas });
+            return performance.now() - inicio;
+        })();
+
+        const natural = await medirVista({ orden: null, filtro: '' });
+        const porFecha = await medirVista({ orden: { campo: 'Fecha', descendente: true }, filtro: '' });
+        const porSi = await medirVista({ orden: { campo: 'TotalSi', descendente: false }, filtro: '' });
+        const filtro = await medirVista({ orden: { campo: 'Fecha', descendente: true }, filtro: 'boletín' });
+        r.ordenFecha = porFecha;
+        r.ordenSi = porSi;
+        r.filtro = filtro;
+
+        r.renderVirtual = await medirAsync(async () => {
+            await tabla.mostrar(natural.vista, true);
+            void tbodyVirtual.offsetHeight;
+        });
+
+        // Cada salto pide al worker las filas de la nueva ventana
+        let totalScroll = 0;
+        for (let k = 0; k < SALTOS_SCROLL; k++) {
+            totalScroll += await medirAsync(async () => {
+                contenedor.scrollTop = Math.random() * contenedor.scrollHeight;
+                await tabla.renderizarVentana();
+                void tbodyVirtual.offsetHeight;
+            });
+        }
+        r.scrollVirtual = totalScroll / SALTOS_SCROLL;
+
+        r.renderCompleto = medir(() => {
+            tbodyCompleta.innerHTML = filas.map(filaVotacionHTML).join('');
+            void tbodyCompleta.offsetHeight;
+        });
+        tbodyCompleta.innerHTML = '';
+
+        filasResultado.push(r);
+    }
+
+    const f = x => x.toFixed(1).padStart(9);
+    const lineas = [
+        '    filas | parseo JSON | clon filas | clon resumen | envío worker | orden Fecha (worker) | orden TotalSi (worker) | filtro (worker) | render virtual | scroll virtual | render completo',
+    ];
+    for (const r of filasResultado) {
+        lineas.push([
+            String(r.filas).padStart(9),
+            f(r.parseoPrincipal).padStart(11),
+            f(r.clonFilas).padStart(10),
+            f(r.clonResumen).padStart(12),
+            f(r.envioWorker).padStart(12),
+            `${f(r.ordenFecha.total)} (${f(r.ordenFecha.worker).trim()})`.padStart(20),
+            `${f(r.ordenSi.total)} (${f(r.ordenSi.worker).trim()})`.padStart(22),
+            `${f(r.filtro.total)} (${f(r.filtro.worker).trim()})`.padStart(15),
+            f(r.renderVirtual).padStart(14),
+            f(r.scrollVirtual).padStart(14),
+            f(r.renderCompleto).padStart(15)
+        ].join(' | '));
+    }
+
+    salida.textContent = lineas.join('\n');
+    document.title = 'listo';
+    console.log(salida.textContent);
+}
+
+ejecutarBenchmark().catch(error => {
+    document.getElementById('resultados').textContent = `Error: ${error.message}`;
+    document.title = 'error';
+});
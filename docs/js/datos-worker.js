@@ -0,0 +1,213 @@
+/**
+ * Web Worker de datos: descarga, parseo, orden y filtro fuera del hilo principal
+ *
+ * Las votaciones se quedan en el worker: el hilo principal recibe solo el
+ * resumen para estadísticas y gráficos, y pide las filas de la ventana
+ * visible de la tabla por índice.
+ *
+ * Mensajes (cada uno con un 'id' que se devuelve en la respuesta):
+ *   { tipo: 'cargar', base, urls }          (manifiesto en base; urls si no existe)
+ *   { tipo: 'filas', votaciones }            (reemplaza las filas, para benchmarks)
+ *   { tipo: 'vista', orden, filtro }         (devuelve un Int32Array transferido)
+ *   { tipo: 'ventana', indices }             (filas de esos índices)
+ */
+
+importScripts('vista-datos.js');
+
+let indice = crearIndiceVotaciones([]);
+
+async function cargarJSON(url, opciones) {
+    const respuesta = await fetch(url, opciones);
+    return respuesta.ok ? respuesta.json() : null;
+}
+
+/*
+ * Copia local de las votaciones (IndexedDB), con la versión del manifiesto
+ * a la que corresponde, para descargar solo los registros de cambios.
+ */
+const BD_NOMBRE = 'seguimiento-legislativo';
+const BD_ALMACEN = 'datos';
+
+function abrirBD() {
+    return new Promise((resolve, reject) => {
+        const solicitud = indexedDB.open(BD_NOMBRE, 1);
+        solicitud.onupgradeneeded = () => solicitud.result.createObjectStore(BD_ALMACEN);
+        solicitud.onsuccess = () => resolve(solicitud.result);
+        solicitud.onerror = () => reject(solicitud.error);
+    });
+}
+
+async function leerLocal(clave) {
+    const bd = await abrirBD();
+    return new Promise((resolve, reject) => {
+        const solicitud = bd.transaction(BD_ALMACEN).objectStore(BD_ALMACEN).get(clave);
+        solicitud.onsuccess = () => resolve(solicitud.result || null);
+        solicitud.onerror = () => reject(solicitud.error);
+    });
+}
+
+async function guardarLocal(clave, valor) {
+    const bd = await abrirBD();
+    return new Promise((resolve, reject) => {
+        const transaccion = bd.transaction(BD_ALMACEN, 'readwrite');
+        transaccion.objectStore(BD_ALMACEN).put(valor, clave);
+        transaccion.oncomplete = () => resolve();
+        transaccion.onerror = () => reject(transaccion.error);
+    });
+}
+
+/**
+ * Registros de cambios que llevan de 'desde' a la versión del manifiesto,
+ * o null si la cadena no está completa.
+ *
+ * Una versión puede repetirse (los datos cambian y luego vuelven atrás:
+ * A→B, B→A, A→C), así que se busca el camino más corto y cada versión se
+ * visita una sola vez.
+ */
+function cadenaDeCambios(manifiesto, desde) {
+    const previo = new Map([[desde, null]]);
+    let frontera = [desde];
+    while (frontera.length && !previo.has(manifiesto.version)) {
+        const siguiente = [];
+        for (const version of frontera) {
+            for (const paso of manifiesto.cambios) {
+                if (paso.desde === version && !previo.has(paso.hasta)) {
+                    previo.set(paso.hasta, paso);
+                    siguiente.push(paso.hasta);
+                }
+            }
+        }
+        frontera = siguiente;
+    }
+    if (!previo.has(manifiesto.version)) return null;
+
+    const cadena = [];
+    for (let paso = previo.get(manifiesto.version); paso; paso = previo.get(paso.desde)) {
+        cadena.unshift(paso);
+    }
+    return cadena;
+}
+
+/**
+ * Orden de la ventana publicada: Fecha descendente y, a igual Fecha, Id
+ * descendente (por largo y luego como texto), como _orden_reciente en
+ * scripts/update_data.py.
+ */
+function compararRecientes(a, b) {
+    const fechaA = a.Fecha || '', fechaB = b.Fecha || '';
+    if (fechaA !== fechaB) return fechaA < fechaB ? 1 : -1;
+    const idA = a.Id == null ? '' : String(a.Id), idB = b.Id == null ? '' : String(b.Id);
+    if (idA.length !== idB.length) return idB.length - idA.length;
+    return idA < idB ? 1 : idA > idB ? -1 : 0;
+}
+
+/**
+ * Aplica registros de cambios a la copia local de votaciones.
+ *
+ * Cada registro lleva de una ventana publicada (las últimas 'limite'
+ * votaciones) a la siguiente: 'eliminadas' son las que salieron de la
+ * ventana y 'agregadas' las que entraron, aunque no hayan cambiado.
+ */
+function aplicarCambios(datos, registros, limite) {
+    const porId = new Map(datos.votaciones.map(v => [String(v.Id), v]));
+    let metadata = datos.metadata;
+
+    for (const registro of registros) {
+        for (const id of registro.eliminadas) {
+            porId.delete(String(id));
+        }
+        for (const v of registro.agregadas.concat(registro.modificadas)) {
+            porId.set(String(v.Id), v);
+        }
+        metadata = registro.metadata || metadata;
+    }
+
+    const votaciones = Array.from(porId.values())
+        .sort(compararRecientes)
+        .slice(0, limite);
+    return { metadata, votaciones };
+}
+
+/**
+ * Votaciones de la versión del manifiesto: desde la copia local si está al día,
+ * aplicando los registros de cambios si es posible, o con la descarga completa
+ */
+async function cargarVotacionesVersionadas(base, manifiesto) {
+    const local = await leerLocal('votaciones').catch(() => null);
+    if (local && local.version === manifiesto.version) return local.datos;
+
+    let datos = null;
+    const cadena = local && cadenaDeCambios(manifiesto, local.version);
+    if (cadena) {
+        const registros = await Promise.all(cadena.map(c => cargarJSON(base + c.archivo)));
+        if (registros.every(Boolean)) {
+            datos = aplicarCambios(local.datos, registros, manifiesto.limite_votaciones);
+        }
+    }
+    if (!datos) {
+        datos = await cargarJSON(base + manifiesto.archivos.votaciones);
+    }
+
+    if (datos) {
+        guardarLocal('votaciones', { version: manifiesto.version, datos }).catch(() => {});
+    }
+    return datos;
+}
+
+/**
+ * Carga los datos del sitio a través del manifiesto. Los archivos versionados
+ * no cambian nunca, así que se aceptan desde la caché HTTP; el manifiesto
+ * se revalida siempre.
+ */
+async function cargarVersionado(base) {
+    const manifiesto = await cargarJSON(base + 'manifest.json', { cache: 'no-cache' });
+    if (!manifiesto) return null;
+
+    const opciones = { cache: 'force-cache' };
+    const [estadisticas, statsPorAnio, datosVotaciones, series] = await Promise.all([
+        cargarJSON(base + manifiesto.archivos.estadisticas, opciones),
+        cargarJSON(base + manifiesto.archivos.stats_por_anio, opciones),
+        cargarVotacionesVersionadas(base, manifiesto),
+        manifiesto.archivos.series ? cargarJSON(base + manifiesto.archivos.series, opciones) : null
+    ]);
+    if (estadisticas) {
+        // La fecha no va en los archivos versionados (cambiaría el hash)
+        estadisticas.fecha_actualizacion = manifiesto.fecha_actualizacion.replace('T', ' ').slice(0, 19);
+    }
+    return [estadisticas, statsPorAnio, datosVotaciones, series];
+}
+
+self.onmessage = async (event) => {
+    const { id, tipo } = event.data;
+
+    try {
+        if (tipo === 'cargar') {
+            // Todas las descargas en paralelo; sin manifiesto, los archivos sin versión
+            const [estadisticas, statsPorAnio, datosVotaciones, series] =
+                await cargarVersionado(event.data.base).catch(() => null) ||
+                await Promise.all(event.data.urls.map(url => cargarJSON(url)));
+            const votaciones = (datosVotaciones && datosVotaciones.votaciones) || [];
+            indice = crearIndiceVotaciones(votaciones);
+            const resumen = resumirVotaciones(votaciones);
+            self.postMessage({ id, ok: true, estadisticas, statsPorAnio, series, resumen });
+
+        } else if (tipo === 'filas') {
+            indice = crearIndiceVotaciones(event.data.votaciones);
+            self.postMessage({ id, ok: true, total: indice.votaciones.length });
+
+        } else if (tipo === 'vista') {
+            const inicio = performance.now();
+            const vista = calcularVista(indice, event.data.orden, event.data.filtro);
+            const duracion = performance.now() - inicio;
+            self.postMessage({ id, ok: true, vista, duracion }, [vista.buffer]);
+
+        } else if (tipo === 'ventana') {
+            self.postMessage({ id, ok: true, filas: filasDeIndices(indice, event.data.indices) });
+
+        } else {
+            throw new Error(`Mensaje desconocido: ${tipo}`);
+        }
+    } catch (error) {
+        self.postMessage({ id, ok: false, error: error.message });
+    }
+};
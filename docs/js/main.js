@@ -4,12 +4,32 @@
 
 // Estado global de la aplicación
 const appState = {
-    votaciones: [],
+    totalVotaciones: 0,
+    resumen: null,
     estadisticas: {},
     statsPorAnio: {},
+    series: null,
+    vista: new Int32Array(0),
+    orden: null,
+    filtro: '',
     cargando: true
 };
 
+// Datos del sitio: el worker los resuelve vía data/manifest.json;
+// los archivos sin versión quedan como respaldo
+const BASE_DATOS = 'data/';
+const URLS_DATOS = ['data/estadisticas.json', 'data/stats_por_anio.json', 'data/votaciones.json', 'data/series.json'];
+
+// Campos importantes a mostrar en la tabla
+const CAMPOS_TABLA = ['Fecha', 'Descripcion', 'Resultado', 'Tipo', 'TotalSi', 'TotalNo'];
+
+// Worker de datos (null si el navegador no lo soporta) y tabla virtual
+let workerDatos = null;
+let tablaVirtual = null;
+let indiceLocal = null;
+const solicitudesWorker = new Map();
+let siguienteSolicitud = 1;
+
 /**
  * Inicializa la aplicación
  */
@@ -32,32 +52,82 @@ async function init() {
 }
 
 /**
- * Carga datos desde archivos JSON
+ * Crea el Web Worker de datos; si no es posible, todo se hace en el hilo principal
+ */
+function crearWorkerDatos() {
+    if (!window.Worker) return null;
+    try {
+        const worker = new Worker('js/datos-worker.js');
+        worker.onmessage = (event) => {
+            const { id, ok, error } = event.data;
+            const solicitud = solicitudesWorker.get(id);
+            if (!solicitud) return;
+            solicitudesWorker.delete(id);
+            ok ? solicitud.resolve(event.data) : solicitud.reject(new Error(error));
+        };
+        worker.onerror = (event) => {
+            // El script del worker no cargó: rechazar todo lo pendiente
+            solicitudesWorker.forEach(solicitud => solicitud.reject(new Error(event.message || 'Error en worker')));
+            solicitudesWorker.clear();
+        };
+        return worker;
+    } catch (error) {
+        console.warn('Web Worker no disponible, usando hilo principal:', error);
+        return null;
+    }
+}
+
+/**
+ * Envía un mensaje al worker y espera su respuesta
+ */
+function llamarWorker(mensaje) {
+    return new Promise((resolve, reject) => {
+        const id = siguienteSolicitud++;
+        solicitudesWorker.set(id, { resolve, reject });
+        workerDatos.postMessage({ id, ...mensaje });
+    });
+}
+
+/**
+ * Carga datos desde archivos JSON (en el worker, con descargas en paralelo)
  */
 async function cargarDatos() {
     try {
-        // Cargar estadísticas
-        const respuestaStats = await fetch('data/estadisticas.json');
-        if (respuestaStats.ok) {
-            appState.estadisticas = await respuestaStats.json();
-            console.log('📊 Estadísticas cargadas:', appState.estadisticas);
-        }
+        workerDatos = crearWorkerDatos();
         
-        // Cargar estadísticas por año
-        const respuestaStatsPorAnio = await fetch('data/stats_por_anio.json');
-        if (respuestaStatsPorAnio.ok) {
-            appState.statsPorAnio = await respuestaStatsPorAnio.json();
-            console.log('📈 Estadísticas por año cargadas');
+        let datos = null;
+        if (workerDatos) {
+            try {
+                datos = await llamarWorker({
+                    tipo: 'cargar',
+                    base: new URL(BASE_DATOS, location.href).href,
+                    urls: URLS_DATOS.map(u => new URL(u, location.href).href)
+                });
+            } catch (error) {
+                console.warn('Falló el worker de datos, usando hilo principal:', error);
+                workerDatos = null;
+            }
         }
         
-        // Cargar votaciones
-        const respuestaVotaciones = await fetch('data/votaciones.json');
-        if (respuestaVotaciones.ok) {
-            const data = await respuestaVotaciones.json();
-            appState.votaciones = data.votaciones || [];
-            console.log('📋 Votaciones cargadas:', appState.votaciones.length);
+        if (!datos) {
+            const [estadisticas, statsPorAnio, datosVotaciones, series] = await Promise.all(
+                URLS_DATOS.map(url => fetch(url).then(r => (r.ok ? r.json() : null)))
+            );
+            const votaciones = (datosVotaciones && datosVotaciones.votaciones) || [];
+            indiceLocal = crearIndiceVotaciones(votaciones);
+            datos = { estadisticas, statsPorAnio, series, resumen: resumirVotaciones(votaciones) };
         }
         
+        // Las filas quedan en el worker (o en indiceLocal); aquí solo el resumen
+        appState.estadisticas = datos.estadisticas || {};
+        appState.statsPorAnio = datos.statsPorAnio || {};
+        appState.resumen = datos.resumen;
+        appState.totalVotaciones = datos.resumen.total;
+        appState.series = datos.series || null;
+        console.log('📊 Estadísticas cargadas:', appState.estadisticas);
+        console.log('📋 Votaciones cargadas:', appState.totalVotaciones);
+        
+        appState.vista = await calcularVistaTabla();
         appState.cargando = false;
         
     } catch (error) {
@@ -67,17 +137,39 @@ async function cargarDatos() {
     }
 }
 
+/**
+ * Calcula los índices visibles según el orden y filtro actuales
+ */
+async function calcularVistaTabla() {
+    if (workerDatos) {
+        const respuesta = await llamarWorker({ tipo: 'vista', orden: appState.orden, filtro: appState.filtro });
+        return respuesta.vista;
+    }
+    return calcularVista(indiceLocal, appState.orden, appState.filtro);
+}
+
+/**
+ * Filas de la tabla para una lista de índices de la vista
+ */
+async function obtenerFilasTabla(indices) {
+    if (workerDatos) {
+        const respuesta = await llamarWorker({ tipo: 'ventana', indices });
+        return respuesta.filas;
+    }
+    return filasDeIndices(indiceLocal, indices);
+}
+
 /**
  * Renderiza las estadísticas generales
  */
 function renderizarEstadisticas() {
     const stats = appState.estadisticas;
-    const votaciones = appState.votaciones;
+    const resumen = appState.resumen;
     
     // Total votaciones (usar el total real de estadísticas, no solo las cargadas)
     const totalElement = document.getElementById('total-votaciones');
     if (totalElement) {
-        const totalReal = stats.total_votaciones || votaciones.length;
+        const totalReal = stats.total_votaciones || resumen.total;
         totalElement.textContent = formatearNumero(totalReal);
     }
     
@@ -93,75 +185,135 @@ function renderizarEstadisticas() {
         const totalAprobados = Object.values(stats.por_anio)
             .reduce((sum, anio) => sum + (anio.aprobados || 0), 0);
         aprobadosElement.textContent = formatearNumero(totalAprobados);
-    } else if (votaciones.length > 0) {
-        const aprobados = votaciones.filter(v => 
-            v.Resultado && v.Resultado.toLowerCase().includes('aprobado')
-        ).length;
-        aprobadosElement.textContent = formatearNumero(aprobados);
+    } else if (aprobadosElement && resumen.total > 0) {
+        aprobadosElement.textContent = formatearNumero(resumen.aprobados);
     }
     
     // Promedio votos Sí (de votaciones cargadas)
     const promedioElement = document.getElementById('promedio-si');
-    if (promedioElement && votaciones.length > 0) {
-        const suma = votaciones.reduce((acc, v) => acc + (parseInt(v.TotalSi) || 0), 0);
-        const promedio = Math.round(suma / votaciones.length);
+    if (promedioElement && resumen.total > 0) {
+        const promedio = Math.round(resumen.sumaSi / resumen.total);
         promedioElement.textContent = formatearNumero(promedio);
     }
 }
 
 /**
- * Renderiza la tabla de datos
+ * Genera el HTML de una fila de la tabla
  */
-function renderizarTabla() {
-    const votaciones = appState.votaciones;
+function filaVotacionHTML(votacion) {
+    const celdas = CAMPOS_TABLA
+        .map(campo => {
+            let valor = votacion[campo] || '-';
+            
+            // Formatear fecha
+            if (campo === 'Fecha' && valor !== '-') {
+                try {
+                    const fecha = new Date(valor);
+                    valor = fecha.toLocaleDateString('es-CL');
+                } catch (e) {}
+            }
+            
+            // Agregar badge para resultado
+            if (campo === 'Resultado') {
+                const clase = esAprobado(votacion) ? 'badge-success' : 'badge-danger';
+                return `<td><span class="badge ${clase}">${valor}</span></td>`;
+            }
+            
+            return `<td>${truncarTexto(valor, 60)}</td>`;
+        })
+        .join('');
     
-    if (!votaciones || votaciones.length === 0) {
+    return `<tr>${celdas}</tr>`;
+}
+
+/**
+ * Renderiza la tabla de datos (virtualizada: solo las filas visibles)
+ */
+function renderizarTabla() {
+    if (appState.totalVotaciones === 0) {
         console.log('No hay votaciones para mostrar');
         return;
     }
     
-    // Campos importantes a mostrar
-    const camposImportantes = ['Fecha', 'Descripcion', 'Resultado', 'Tipo', 'TotalSi', 'TotalNo'];
+    const contenedor = document.querySelector('.table-container');
+    const tbody = document.getElementById('table-body');
+    if (!contenedor || !tbody) return;
+    
+    renderizarEncabezados();
     
-    // Renderizar headers
-    const headersRow = document.getElementById('table-headers');
-    if (headersRow) {
-        headersRow.innerHTML = camposImportantes
-            .map(campo => `<th>${formatearCampo(campo)}</th>`)
-            .join('');
+    if (!tablaVirtual) {
+        tablaVirtual = new TablaVirtual(contenedor, tbody, {
+            renderizarFila: filaVotacionHTML,
+            obtenerFilas: obtenerFilasTabla,
+            columnas: CAMPOS_TABLA.length
+        });
+        
+        const buscador = document.getElementById('buscar-votaciones');
+        if (buscador) {
+            let temporizador = null;
+            buscador.addEventListener('input', () => {
+                clearTimeout(temporizador);
+                temporizador = setTimeout(() => filtrarTabla(buscador.value), 150);
+            });
+        }
     }
     
-    // Renderizar datos (primeros 50 registros)
-    const tbody = document.getElementById('table-body');
-    if (tbody) {
-        tbody.innerHTML = votaciones
-            .slice(0, 50)
-            .map(votacion => {
-                const celdas = camposImportantes
-                    .map(campo => {
-                        let valor = votacion[campo] || '-';
-                        
-                        // Formatear fecha
-                        if (campo === 'Fecha' && valor !== '-') {
-                            try {
-                                const fecha = new Date(valor);
-                                valor = fecha.toLocaleDateString('es-CL');
-                            } catch (e) {}
-                        }
-                        
-                        // Agregar badge para resultado
-                        if (campo === 'Resultado') {
-                            const clase = valor.toLowerCase().includes('aprobado') ? 'badge-success' : 'badge-danger';
-                            return `<td><span class="badge ${clase}">${valor}</span></td>`;
-                        }
-                        
-                        return `<td>${truncarTexto(valor, 60)}</td>`;
-                    })
-                    .join('');
-                
-                return `<tr>${celdas}</tr>`;
-            })
-            .join('');
+    tablaVirtual.mostrar(appState.vista)
+        .catch(error => console.error('Error renderizando la tabla:', error));
+    actualizarConteoTabla();
+}
+
+/**
+ * Renderiza los encabezados; un click ordena por esa columna
+ */
+function renderizarEncabezados() {
+    const headersRow = document.getElementById('table-headers');
+    if (!headersRow) return;
+    
+    headersRow.innerHTML = CAMPOS_TABLA
+        .map(campo => {
+            let indicador = '';
+            if (appState.orden && appState.orden.campo === campo) {
+                indicador = appState.orden.descendente ? ' ▼' : ' ▲';
+            }
+            return `<th data-campo="${campo}">${formatearCampo(campo)}${indicador}</th>`;
+        })
+        .join('');
+    
+    headersRow.querySelectorAll('th').forEach(th => {
+        th.addEventListener('click', () => ordenarTabla(th.dataset.campo));
+    });
+}
+
+/**
+ * Ordena la tabla por un campo (segundo click invierte el orden)
+ */
+async function ordenarTabla(campo) {
+    const actual = appState.orden;
+    appState.orden = {
+        campo,
+        descendente: actual && actual.campo === campo ? !actual.descendente : campo === 'Fecha'
+    };
+    appState.vista = await calcularVistaTabla();
+    renderizarTabla();
+}
+
+/**
+ * Filtra la tabla por texto libre
+ */
+async function filtrarTabla(texto) {
+    appState.filtro = texto;
+    appState.vista = await calcularVistaTabla();
+    renderizarTabla();
+}
+
+/**
+ * Muestra cuántas filas coinciden con el filtro
+ */
+function actualizarConteoTabla() {
+    const conteo = document.getElementById('conteo-tabla');
+    if (conteo) {
+        conteo.textContent = `${formatearNumero(appState.vista.length)} de ${formatearNumero(appState.totalVotaciones)} votaciones`;
     }
 }
 
@@ -222,11 +374,13 @@ function truncarTexto(texto, maxLength) {
     return str.substring(0, maxLength) + '...';
 }
 
-// Iniciar cuando el DOM esté listo
-if (document.readyState === 'loading') {
-    document.addEventListener('DOMContentLoaded', init);
-} else {
-    init();
+// Iniciar cuando el DOM esté listo (bench.html reutiliza este script sin iniciar la app)
+if (!window.BENCH) {
+    if (document.readyState === 'loading') {
+        document.addEventListener('DOMContentLoaded', init);
+    } else {
+        init();
+    }
 }
 
 // Exportar para uso en otros scripts
@@ -0,0 +1,127 @@
+/**
+ * Tabla virtualizada: solo se renderizan las filas visibles
+ *
+ * El <tbody> contiene una fila espaciadora arriba, las filas de la ventana
+ * visible (más un margen) y una fila espaciadora abajo, de modo que la
+ * barra de desplazamiento refleja el total de filas.
+ *
+ * La tabla no tiene las filas: las pide por índice con obtenerFilas(),
+ * que puede ser asíncrona (el worker de datos las conserva), y guarda en
+ * caché las ya recibidas.
+ */
+
+class TablaVirtual {
+    /**
+     * @param {HTMLElement} contenedor Elemento con scroll vertical
+     * @param {HTMLElement} tbody Cuerpo de la tabla
+     * @param {Object} opciones renderizarFila(fila) -> HTML, obtenerFilas(Int32Array) -> filas
+     *                          (o Promise de filas), columnas, altoFila, filasExtra, maxCache
+     */
+    constructor(contenedor, tbody, opciones) {
+        this.contenedor = contenedor;
+        this.tbody = tbody;
+        this.renderizarFila = opciones.renderizarFila;
+        this.obtenerFilas = opciones.obtenerFilas;
+        this.columnas = opciones.columnas;
+        this.altoFila = opciones.altoFila || 53;
+        this.filasExtra = opciones.filasExtra || 10;
+        this.maxCache = opciones.maxCache || 2000;
+
+        this.vista = new Int32Array(0);
+        this.ventana = { inicio: -1, fin: -1 };
+        this.pendiente = false;
+
+        // Filas recibidas por índice; 'generacion' invalida respuestas de datos anteriores
+        this.cache = new Map();
+        this.generacion = 0;
+        this.solicitud = 0;
+
+        this.contenedor.addEventListener('scroll', () => this.programarRender(), { passive: true });
+    }
+
+    /**
+     * Muestra una nueva vista (índices sobre las filas) desde el inicio
+     *
+     * @param {Int32Array} vista Índices visibles, en orden
+     * @param {boolean} datosNuevos Las filas cambiaron (descarta la caché)
+     */
+    mostrar(vista, datosNuevos = false) {
+        if (datosNuevos) {
+            this.cache.clear();
+            this.generacion++;
+        }
+        this.vista = vista;
+        this.ventana = { inicio: -1, fin: -1 };
+        this.contenedor.scrollTop = 0;
+        return this.renderizarVentana();
+    }
+
+    /**
+     * Agrupa los eventos de scroll en un render por frame
+     */
+    programarRender() {
+        if (this.pendiente) return;
+        this.pendiente = true;
+        requestAnimationFrame(() => {
+            this.pendiente = false;
+            this.renderizarVentana().catch(error => console.error('Error renderizando la tabla:', error));
+        });
+    }
+
+    espaciador(alto) {
+        if (alto <= 0) return '';
+        return `<tr class="espaciador" style="height: ${alto}px"><td colspan="${this.columnas}"></td></tr>`;
+    }
+
+    /**
+     * Pide las filas de la ventana que no están en caché
+     */
+    async cargarFaltantes(inicio, fin) {
+        if (this.cache.size + (fin - inicio) > this.maxCache) this.cache.clear();
+
+        const faltantes = [];
+        for (let i = inicio; i < fin; i++) {
+            if (!this.cache.has(this.vista[i])) faltantes.push(this.vista[i]);
+        }
+        if (faltantes.length === 0) return;
+
+        const generacion = this.generacion;
+        const filas = await this.obtenerFilas(Int32Array.from(faltantes));
+        if (generacion !== this.generacion) return;
+        faltantes.forEach((i, k) => this.cache.set(i, filas[k]));
+    }
+
+    /**
+     * Renderiza solo las filas dentro de la ventana visible
+     */
+    async renderizarVentana() {
+        const total = this.vista.length;
+        const { scrollTop, clientHeight } = this.contenedor;
+
+        const inicio = Math.max(0, Math.floor(scrollTop / this.altoFila) - this.filasExtra);
+        const fin = Math.min(total, Math.ceil((scrollTop + clientHeight) / this.altoFila) + this.filasExtra);
+
+        if (inicio === this.ventana.inicio && fin === this.ventana.fin) return;
+        this.ventana = { inicio, fin };
+
+        // Si mientras llegan las filas se pidió otra ventana, esta se descarta
+        const solicitud = ++this.solicitud;
+        await this.cargarFaltantes(inicio, fin);
+        if (solicitud !== this.solicitud) return;
+
+        const partes = [this.espaciador(inicio * this.altoFila)];
+        for (let i = inicio; i < fin; i++) {
+            partes.push(this.renderizarFila(this.cache.get(this.vista[i])));
+        }
+        partes.push(this.espaciador((total - fin) * this.altoFila));
+        this.tbody.innerHTML = partes.join('');
+
+        // Ajustar al alto real de las filas (depende del CSS y la pantalla)
+        const fila = this.tbody.querySelector('tr:not(.espaciador)');
+        if (fila && Math.abs(fila.offsetHeight - this.altoFila) > 1) {
+            this.altoFila = fila.offsetHeight;
+            this.ventana = { inicio: -1, fin: -1 };
+            return this.renderizarVentana();
+        }
+    }
+}
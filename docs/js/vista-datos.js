@@ -0,0 +1,124 @@
+/**
+ * Orden, filtro y resumen de votaciones
+ *
+ * Se usa dentro del Web Worker (datos-worker.js) y, si el navegador no
+ * soporta workers, directamente en el hilo principal. Las vistas son
+ * Int32Array de índices sobre el arreglo de votaciones, para poder
+ * transferirlas entre hilos sin copiar. Las filas se quedan donde se
+ * parsearon: el hilo principal recibe solo el resumen y las filas de la
+ * ventana visible de la tabla.
+ */
+
+const CAMPOS_NUMERICOS = new Set(['Id', 'TotalSi', 'TotalNo', 'TotalAbstencion', 'TotalDispensado']);
+const CAMPOS_BUSQUEDA = ['Descripcion', 'Resultado', 'Tipo', 'Quorum', 'Fecha', 'Id'];
+
+/**
+ * Indica si una votación fue aprobada según su código de resultado
+ * (1 = Aprobado, 2 = Unánime; ver scripts/clasificacion.py)
+ */
+function esAprobado(votacion) {
+    return votacion.Resultado_Valor === '1' || votacion.Resultado_Valor === '2';
+}
+
+/**
+ * Agregados de las votaciones para las estadísticas y los gráficos,
+ * en una sola pasada
+ */
+function resumirVotaciones(votaciones) {
+    const resumen = {
+        total: votaciones.length,
+        aprobados: 0,
+        sumaSi: 0,
+        porMes: {},
+        resultados: {},
+        tipos: {},
+        votos: { si: 0, no: 0, abstencion: 0, conteo: 0 }
+    };
+    for (const v of votaciones) {
+        resumen.sumaSi += parseInt(v.TotalSi) || 0;
+        if (esAprobado(v)) resumen.aprobados++;
+        if (v.Fecha) {
+            const mes = v.Fecha.slice(0, 7);
+            resumen.porMes[mes] = (resumen.porMes[mes] || 0) + 1;
+        }
+        const resultado = v.Resultado || 'Sin especificar';
+        resumen.resultados[resultado] = (resumen.resultados[resultado] || 0) + 1;
+        const tipo = v.Tipo || 'Sin especificar';
+        resumen.tipos[tipo] = (resumen.tipos[tipo] || 0) + 1;
+        if (v.TotalSi) {
+            resumen.votos.si += parseInt(v.TotalSi) || 0;
+            resumen.votos.no += parseInt(v.TotalNo) || 0;
+            resumen.votos.abstencion += parseInt(v.TotalAbstencion) || 0;
+            resumen.votos.conteo++;
+        }
+    }
+    return resumen;
+}
+
+/**
+ * Filas correspondientes a una lista de índices (la ventana visible de la tabla)
+ */
+function filasDeIndices(indice, indices) {
+    return Array.from(indices, i => indice.votaciones[i]);
+}
+
+/**
+ * Prepara las votaciones para ordenar y filtrar rápidamente
+ */
+function crearIndiceVotaciones(votaciones) {
+    const textos = new Array(votaciones.length);
+    for (let i = 0; i < votaciones.length; i++) {
+        const v = votaciones[i];
+        textos[i] = CAMPOS_BUSQUEDA.map(campo => v[campo] || '').join(' ').toLowerCase();
+    }
+    return { votaciones, textos, ordenes: new Map() };
+}
+
+/**
+ * Índices ordenados por un campo (se guardan para reutilizarlos al filtrar)
+ */
+function ordenarIndices(indice, campo, descendente) {
+    const clave = `${campo}:${descendente ? 'desc' : 'asc'}`;
+    if (indice.ordenes.has(clave)) return indice.ordenes.get(clave);
+
+    const votaciones = indice.votaciones;
+    const n = votaciones.length;
+    const orden = new Int32Array(n);
+    for (let i = 0; i < n; i++) orden[i] = i;
+
+    if (campo) {
+        if (CAMPOS_NUMERICOS.has(campo)) {
+            const valores = new Float64Array(n);
+            for (let i = 0; i < n; i++) valores[i] = parseFloat(votaciones[i][campo]) || 0;
+            orden.sort((a, b) => (valores[a] - valores[b]) || (a - b));
+        } else {
+            const valores = votaciones.map(v => v[campo] || '');
+            orden.sort((a, b) => (valores[a] < valores[b] ? -1 : valores[a] > valores[b] ? 1 : a - b));
+        }
+        if (descendente) orden.reverse();
+    }
+
+    indice.ordenes.set(clave, orden);
+    return orden;
+}
+
+/**
+ * Calcula la vista (índices visibles, en orden) para un orden y un filtro de texto
+ */
+function calcularVista(indice, orden, filtro) {
+    const base = orden
+        ? ordenarIndices(indice, orden.campo, orden.descendente)
+        : ordenarIndices(indice, null, false);
+
+    const termino = (filtro || '').trim().toLowerCase();
+    if (!termino) return base.slice();
+
+    const textos = indice.textos;
+    const resultado = new Int32Array(base.length);
+    let total = 0;
+    for (let k = 0; k < base.length; k++) {
+        const i = base[k];
+        if (textos[i].includes(termino)) resultado[total++] = i;
+    }
+    return resultado.slice(0, total);
+}
@@ -4,6 +4,7 @@
 
 let charts = {
     evolucion: null,
+    tendencia: null,
     actividad: null,
     resultados: null,
     tipos: null,
@@ -26,22 +27,24 @@ function initVisualizaciones() {
  * Crea todos los gráficos
  */
 function crearTodosLosGraficos() {
-    const votaciones = window.appState.votaciones;
+    // Agregados calculados donde están las filas (worker o hilo principal; ver vista-datos.js)
+    const resumen = window.appState.resumen;
     const statsPorAnio = window.appState.statsPorAnio;
     
-    if (!votaciones || votaciones.length === 0) {
+    if (!resumen || resumen.total === 0) {
         console.log('No hay datos para visualizar');
         return;
     }
     
-    console.log('📊 Creando visualizaciones con', votaciones.length, 'votaciones');
+    console.log('📊 Creando visualizaciones con', resumen.total, 'votaciones');
     console.log('📊 Stats por año:', Object.keys(statsPorAnio).length, 'años');
     
     crearGraficoEvolucion(statsPorAnio);
-    crearGraficoActividad(votaciones);
-    crearGraficoResultados(votaciones);
-    crearGraficoTipos(votaciones);
-    crearGraficoVotos(votaciones);
+    crearGraficoTendencia(window.appState.series);
+    crearGraficoActividad(resumen.porMes);
+    crearGraficoResultados(resumen.resultados);
+    crearGraficoTipos(resumen.tipos);
+    crearGraficoVotos(resumen.votos);
 }
 
 /**
@@ -144,42 +147,91 @@ function crearGraficoEvolucion(statsPorAnio) {
     console.log('✓ Gráfico de evolución creado con', anios.length, 'años');
 }
 
+/**
+ * Gráfico de tendencia semanal: votaciones por semana y tasa de aprobación móvil
+ * (docs/data/series.json, generado por scripts/series.py)
+ */
+function crearGraficoTendencia(series) {
+    const canvas = document.getElementById('tendenciaChart');
+    if (!canvas || !series || !series.semanal) return;
+    
+    const ctx = canvas.getContext('2d');
+    const semanal = series.semanal;
+    
+    // Las semanas son continuas desde 'inicio'
+    const inicio = new Date(`${semanal.inicio}T00:00:00`);
+    const etiquetas = semanal.votaciones.map((_, i) => {
+        const fecha = new Date(inicio);
+        fecha.setDate(fecha.getDate() + 7 * i);
+        return fecha.toLocaleDateString('es-CL', { day: 'numeric', month: 'short', year: 'numeric' });
+    });
+    const aprobacion = semanal.aprobacion_movil.map(v => (v === null ? null : Math.round(v * 1000) / 10));
+    
+    if (charts.tendencia) charts.tendencia.destroy();
+    
+    charts.tendencia = new Chart(ctx, {
+        type: 'bar',
+        data: {
+            labels: etiquetas,
+            datasets: [
+                {
+                    label: 'Votaciones por semana',
+                    data: semanal.votaciones,
+                    backgroundColor: 'rgba(0, 57, 166, 0.5)',
+                    yAxisID: 'y'
+                },
+                {
+                    label: `Aprobación (ventana móvil ${semanal.ventana_aprobacion.replace('D', ' días')})`,
+                    data: aprobacion,
+                    type: 'line',
+                    borderColor: '#2ecc71',
+                    borderWidth: 2,
+                    pointRadius: 0,
+                    spanGaps: true,
+                    yAxisID: 'aprobacion'
+                }
+            ]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            animation: false,
+            interaction: { mode: 'index', intersect: false },
+            plugins: {
+                legend: { display: true, position: 'top' }
+            },
+            scales: {
+                y: { beginAtZero: true, position: 'left' },
+                aprobacion: {
+                    position: 'right',
+                    min: 0,
+                    max: 100,
+                    grid: { drawOnChartArea: false },
+                    ticks: { callback: value => `${value}%` }
+                },
+                x: {
+                    ticks: { maxTicksLimit: 12, maxRotation: 0 }
+                }
+            }
+        }
+    });
+}
+
 /**
  * Gráfico de actividad reciente (últimos 12 meses)
  */
-function crearGraficoActividad(votaciones) {
+function crearGraficoActividad(porMes) {
     const canvas = document.getElementById('actividadChart');
     if (!canvas) return;
     
     const ctx = canvas.getContext('2d');
     
-    // Filtrar últimos 12 meses
+    // Filtrar últimos 12 meses (claves 'YYYY-MM')
     const ahora = new Date();
     const hace12Meses = new Date(ahora.getFullYear(), ahora.getMonth() - 12, 1);
+    const desde = `${hace12Meses.getFullYear()}-${String(hace12Meses.getMonth() + 1).padStart(2, '0')}`;
     
-    const votacionesRecientes = votaciones.filter(v => {
-        if (!v.Fecha) return false;
-        try {
-            const fecha = new Date(v.Fecha);
-            return fecha >= hace12Meses;
-        } catch (e) {
-            return false;
-        }
-    });
-    
-    // Agrupar por mes
-    const porMes = {};
-    votacionesRecientes.forEach(v => {
-        if (!v.Fecha) return;
-        
-        try {
-            const fecha = new Date(v.Fecha);
-            const mes = `${fecha.getFullYear()}-${String(fecha.getMonth() + 1).padStart(2, '0')}`;
-            porMes[mes] = (porMes[mes] || 0) + 1;
-        } catch (e) {}
-    });
-    
-    const meses = Object.keys(porMes).sort();
+    const meses = Object.keys(porMes).filter(m => m >= desde).sort();
     const valores = meses.map(m => porMes[m]);
     
     if (charts.actividad) charts.actividad.destroy();
@@ -217,19 +269,12 @@ function crearGraficoActividad(votaciones) {
 /**
  * Gráfico de resultados (Aprobado/Rechazado)
  */
-function crearGraficoResultados(votaciones) {
+function crearGraficoResultados(resultados) {
     const canvas = document.getElementById('resultadosChart');
     if (!canvas) return;
     
     const ctx = canvas.getContext('2d');
     
-    // Contar resultados
-    const resultados = {};
-    votaciones.forEach(v => {
-        const resultado = v.Resultado || 'Sin especificar';
-        resultados[resultado] = (resultados[resultado] || 0) + 1;
-    });
-    
     if (charts.resultados) charts.resultados.destroy();
     
     charts.resultados = new Chart(ctx, {
@@ -263,19 +308,12 @@ function crearGraficoResultados(votaciones) {
 /**
  * Gráfico de tipos de proyectos
  */
-function crearGraficoTipos(votaciones) {
+function crearGraficoTipos(tipos) {
     const canvas = document.getElementById('tiposChart');
     if (!canvas) return;
     
     const ctx = canvas.getContext('2d');
     
-    // Contar tipos
-    const tipos = {};
-    votaciones.forEach(v => {
-        const tipo = v.Tipo || 'Sin especificar';
-        tipos[tipo] = (tipos[tipo] || 0) + 1;
-    });
-    
     // Ordenar y tomar top 5
     const tiposOrdenados = Object.entries(tipos)
         .sort((a, b) => b[1] - a[1])
@@ -311,24 +349,14 @@ function crearGraficoTipos(votaciones) {
 /**
  * Gráfico de distribución de votos
  */
-function crearGraficoVotos(votaciones) {
+function crearGraficoVotos(votos) {
     const canvas = document.getElementById('votosChart');
     if (!canvas) return;
     
     const ctx = canvas.getContext('2d');
     
-    // Calcular promedios
-    let totalSi = 0, totalNo = 0, totalAbstencion = 0;
-    let count = 0;
-    
-    votaciones.forEach(v => {
-        if (v.TotalSi) {
-            totalSi += parseInt(v.TotalSi) || 0;
-            totalNo += parseInt(v.TotalNo) || 0;
-            totalAbstencion += parseInt(v.TotalAbstencion) || 0;
-            count++;
-        }
-    });
+    // Promedios sobre las votaciones con totales
+    const { si: totalSi, no: totalNo, abstencion: totalAbstencion, conteo: count } = votos;
     
     if (charts.votos) charts.votos.destroy();
     
@@ -0,0 +1,10 @@
+"""
+Permite ejecutar la CLI con: python -m scripts <comando>
+"""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -4,46 +4,99 @@ Cliente para interactuar con la API de OpenData Cámara de Diputados de Chile
 
 import requests
 import xml.etree.ElementTree as ET
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import io
 import json
 import os
+import threading
+
+from .archivo import ArchivoXML, abrir_xml
+from .endpoints import (
+    NAMESPACE, elemento_a_dict, iterar_registros_xml, obtener_esquema
+)
+
+
+def votacion_a_dict(votacion):
+    """
+    Convierte un elemento <Votacion> en diccionario
+    
+    Args:
+        votacion (Element): Elemento XML de la votación
+        
+    Returns:
+        dict: Campos de la votación
+    """
+    return elemento_a_dict(votacion, obtener_esquema('votaciones'))
+
+
+def iterar_votaciones_xml(fuente):
+    """
+    Recorre las votaciones de un XML en streaming, sin cargarlo completo
+    
+    Args:
+        fuente (str): Ruta a un archivo .xml o .xml.gz
+        
+    Yields:
+        dict: Una votación por elemento <Votacion>
+    """
+    return iterar_registros_xml(fuente, obtener_esquema('votaciones'))
+
+
+def _clave_consulta(params):
+    """Identificador de una consulta en el archivo comprimido (ej: el año)"""
+    return '_'.join(str(v) for v in params.values()) or 'todo'
 
 
 class CamaraAPI:
     """Cliente para la API de la Cámara de Diputados"""
     
-    BASE_URL = "https://opendata.camara.cl/camaradiputados/WServices/WSLegislativo.asmx"
+    SERVICIOS_URL = "https://opendata.camara.cl/camaradiputados/WServices"
+    BASE_URL = f"{SERVICIOS_URL}/WSLegislativo.asmx"
     
-    def __init__(self, output_dir='data/raw'):
-        self.session = requests.Session()
+    def __init__(self, output_dir='data/raw', archivo_dir=None, servicios_url=None):
+        # Una sesión HTTP por hilo, para las descargas concurrentes
+        self._local = threading.local()
         self.output_dir = output_dir
         
+        # URL de los servicios; CAMARA_API_URL permite apuntar a un servidor
+        # de prueba (scripts/stub_api.py) sin cambiar el código que llama
+        self.servicios_url = (
+            servicios_url or os.environ.get('CAMARA_API_URL') or self.SERVICIOS_URL
+        ).rstrip('/')
+        
         # Crear directorio si no existe
         os.makedirs(output_dir, exist_ok=True)
+        
+        # Archivo comprimido de respuestas crudas
+        self.archivo = ArchivoXML(archivo_dir or f"{output_dir}/archivo")
+    
+    @property
+    def session(self):
+        """Sesión HTTP del hilo actual"""
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
     
-    def _hacer_peticion(self, endpoint, params):
+    def _hacer_peticion(self, endpoint, params, servicio='WSLegislativo'):
         """
         Método genérico para hacer peticiones al API
         
         Args:
             endpoint (str): Endpoint del servicio
             params (dict): Parámetros de la petición
+            servicio (str): Servicio .asmx que expone el endpoint
             
         Returns:
             str: XML response o None si hay error
         """
-        url = f"{self.BASE_URL}/{endpoint}"
+        url = f"{self.servicios_url}/{servicio}.asmx/{endpoint}"
         
         try:
             response = self.session.post(url, data=params, timeout=30)
             response.raise_for_status()
             
-            # Guardar XML crudo
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{self.output_dir}/{endpoint}_{timestamp}.xml"
-            
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(response.text)
+            # Guardar XML crudo comprimido (una versión por consulta)
+            filename = self.archivo.guardar(endpoint, _clave_consulta(params), response.content)
             
             print(f"✓ Datos guardados en: {filename}")
             return response.text
@@ -63,8 +116,82 @@ class CamaraAPI:
             str: XML con las votaciones
         """
         print(f"Obteniendo votaciones del año {anno}...")
-        params = {'prmAnno': str(anno)}
-        return self._hacer_peticion('retornarVotacionesXAnno', params)
+        return self.obtener('votaciones', anno=anno)
+    
+    def obtener(self, endpoint, usar_cache=False, **params):
+        """
+        Obtiene el XML de cualquier endpoint registrado en ENDPOINTS
+        
+        Args:
+            endpoint (str): Nombre lógico del endpoint (ej: 'mociones')
+            usar_cache (bool): Usar la última versión archivada si existe
+            **params: Parámetros lógicos del endpoint (ej: anno=2024)
+        
+        Returns:
+            str: XML de la respuesta o None si hay error
+        """
+        esquema = obtener_esquema(endpoint)
+        params_api = {
+            esquema['params'][nombre]: str(valor)
+            for nombre, valor in params.items()
+        }
+        
+        if usar_cache:
+            ruta = self.archivo.ultima_version(esquema['operacion'], _clave_consulta(params_api))
+            if ruta:
+                with abrir_xml(ruta) as f:
+                    return f.read().decode('utf-8')
+        
+        return self._hacer_peticion(esquema['operacion'], params_api, servicio=esquema['servicio'])
+    
+    def parsear_registros(self, xml_string, endpoint):
+        """
+        Parsea en streaming el XML de un endpoint registrado
+        
+        Args:
+            xml_string (str): XML a parsear
+            endpoint (str): Nombre lógico del endpoint
+            
+        Returns:
+            list: Lista de diccionarios, uno por registro
+        """
+        if not xml_string:
+            return []
+        
+        try:
+            fuente = io.BytesIO(xml_string.encode('utf-8'))
+            return list(iterar_registros_xml(fuente, obtener_esquema(endpoint)))
+        except ET.ParseError as e:
+            print(f"✗ Error parseando XML de {endpoint}: {e}")
+            return []
+    
+    def descargar(self, endpoint, lista_params, workers=4, usar_cache=False):
+        """
+        Descarga, parsea y guarda en paralelo varias consultas de un endpoint
+        
+        Cada consulta se guarda en su propia partición JSON según la
+        plantilla 'salida' del endpoint (ej: mociones_2024.json).
+        
+        Args:
+            endpoint (str): Nombre lógico del endpoint
+            lista_params (list): Lista de dicts con los parámetros de cada consulta
+            workers (int): Consultas simultáneas al API
+            usar_cache (bool): Usar versiones archivadas cuando existan
+        
+        Returns:
+            list: Lista de (params, registros) en el orden de lista_params
+        """
+        esquema = obtener_esquema(endpoint)
+        
+        def procesar(params):
+            xml_data = self.obtener(endpoint, usar_cache=usar_cache, **params)
+            registros = self.parsear_registros(xml_data, endpoint)
+            if registros:
+                self.guardar_json(registros, esquema['salida'].format(**params))
+            return params, registros
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(procesar, lista_params))
     
     def parsear_xml_votaciones(self, xml_string):
         """
@@ -81,28 +208,15 @@ class CamaraAPI:
         
         try:
             # Namespace de la API de la Cámara
-            namespace = {'ns': 'http://opendata.camara.cl/camaradiputados/v1'}
+            namespace = {'ns': NAMESPACE}
             
             root = ET.fromstring(xml_string)
-            votaciones = []
             
             # Buscar todas las votaciones con namespace
-            for votacion in root.findall('.//ns:Votacion', namespace):
-                vot_dict = {}
-                
-                for child in votacion:
-                    # Remover namespace del tag
-                    tag = child.tag.replace('{http://opendata.camara.cl/camaradiputados/v1}', '')
-                    
-                    # Si el elemento tiene atributo 'Valor', usar ese
-                    if 'Valor' in child.attrib:
-                        vot_dict[tag + '_Valor'] = child.attrib['Valor']
-                        vot_dict[tag] = child.text if child.text else child.attrib['Valor']
-                    else:
-                        # Usar el texto del elemento
-                        vot_dict[tag] = child.text
-                
-                votaciones.append(vot_dict)
+            votaciones = [
+                votacion_a_dict(votacion)
+                for votacion in root.findall('.//ns:Votacion', namespace)
+            ]
             
             print(f"✓ Parseadas {len(votaciones)} votaciones")
             return votaciones
@@ -122,6 +236,24 @@ class CamaraAPI:
                 pass
             return []
     
+    def parsear_archivo_votaciones(self, ruta):
+        """
+        Parsea en streaming un XML de votaciones guardado en disco
+        
+        Args:
+            ruta (str): Ruta al archivo .xml o .xml.gz
+            
+        Returns:
+            list: Lista de diccionarios con votaciones
+        """
+        try:
+            votaciones = list(iterar_votaciones_xml(ruta))
+            print(f"✓ Parseadas {len(votaciones)} votaciones desde {ruta}")
+            return votaciones
+        except Exception as e:
+            print(f"✗ Error parseando {ruta}: {e}")
+            return []
+    
     def explorar_xml(self, xml_string):
         """
         Explora la estructura del XML para debugging
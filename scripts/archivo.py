@@ -0,0 +1,108 @@
+"""
+Archivo comprimido de respuestas XML crudas del API
+
+Cada consulta al API se guarda como una versión gzip independiente:
+
+    data/raw/archivo/<endpoint>/<clave>/<timestamp>.xml.gz
+
+donde <clave> identifica la consulta (por ejemplo el año). Esto permite
+reconstruir todos los JSON sin volver a consultar el API.
+"""
+
+import glob
+import gzip
+import os
+from datetime import datetime
+
+
+EXTENSION = '.xml.gz'
+
+
+def abrir_xml(ruta):
+    """
+    Abre un XML crudo en modo binario, descomprimiendo si es .gz
+
+    Args:
+        ruta (str): Ruta al archivo .xml o .xml.gz
+
+    Returns:
+        file: Archivo abierto en modo binario
+    """
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rb')
+    return open(ruta, 'rb')
+
+
+class ArchivoXML:
+    """Almacena y recupera versiones comprimidas de respuestas del API"""
+
+    def __init__(self, directorio='data/raw/archivo', nivel_compresion=6):
+        self.directorio = directorio
+        self.nivel_compresion = nivel_compresion
+
+    def guardar(self, endpoint, clave, contenido):
+        """
+        Guarda una respuesta como nueva versión comprimida
+
+        Args:
+            endpoint (str): Endpoint del servicio
+            clave (str): Identificador de la consulta (ej: año)
+            contenido (bytes|str): XML de la respuesta
+
+        Returns:
+            str: Ruta del archivo guardado
+        """
+        directorio = os.path.join(self.directorio, endpoint, str(clave))
+        os.makedirs(directorio, exist_ok=True)
+
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        ruta = os.path.join(directorio, f"{timestamp}{EXTENSION}")
+
+        if isinstance(contenido, str):
+            contenido = contenido.encode('utf-8')
+
+        with gzip.open(ruta, 'wb', compresslevel=self.nivel_compresion) as f:
+            f.write(contenido)
+
+        return ruta
+
+    def claves(self, endpoint):
+        """
+        Lista las claves (ej: años) con al menos una versión archivada
+
+        Args:
+            endpoint (str): Endpoint del servicio
+
+        Returns:
+            list: Claves ordenadas
+        """
+        patron = os.path.join(self.directorio, endpoint, '*', f"*{EXTENSION}")
+        return sorted({os.path.basename(os.path.dirname(r)) for r in glob.glob(patron)})
+
+    def versiones(self, endpoint, clave):
+        """
+        Lista las versiones archivadas de una consulta, de más antigua a más reciente
+
+        Args:
+            endpoint (str): Endpoint del servicio
+            clave (str): Identificador de la consulta
+
+        Returns:
+            list: Rutas de los archivos
+        """
+        patron = os.path.join(self.directorio, endpoint, str(clave), f"*{EXTENSION}")
+        return sorted(glob.glob(patron))
+
+    def ultima_version(self, endpoint, clave):
+        """
+        Obtiene la versión más reciente de una consulta
+
+        Args:
+            endpoint (str): Endpoint del servicio
+            clave (str): Identificador de la consulta
+
+        Returns:
+            str: Ruta del archivo o None si no hay versiones
+        """
+        versiones = self.versiones(endpoint, clave)
+        return versiones[-1] if versiones else None
@@ -0,0 +1,269 @@
+"""
+Índice de proyectos de ley por número de boletín
+
+Las votaciones de un mismo proyecto aparecen dispersas entre años, con
+descripciones como "Boletín N° 17286-05". El índice las agrupa en una sola
+pasada: boletín -> votaciones ordenadas por fecha, con su resumen.
+"""
+
+import json
+import os
+import re
+from collections import defaultdict
+
+from .clasificacion import Desenlace, clasificar_votaciones
+
+
+PATRON_BOLETIN = re.compile(r'Bolet[ií]n\s+N[°º]?\s*(\d+)(?:-(\d+))?')
+
+# Boletines por archivo exportado: el shard de un boletín es su número // TAMANO_SHARD
+TAMANO_SHARD = 1000
+
+# Nombre de archivo de un shard exportado (ej: '17.json')
+PATRON_SHARD = re.compile(r'^\d+\.json$')
+
+NOMBRES_DESENLACE = {
+    Desenlace.APROBADO: 'aprobado',
+    Desenlace.RECHAZADO: 'rechazado',
+    Desenlace.OTRO: 'otro',
+    Desenlace.DESCONOCIDO: 'desconocido',
+}
+
+
+def extraer_boletin(descripcion):
+    """
+    Extrae el número de boletín de la descripción de una votación
+
+    Args:
+        descripcion (str): Campo Descripcion (ej: 'Boletín N° 17286-05')
+
+    Returns:
+        str: Boletín normalizado (ej: '17286-05') o None
+    """
+    if not descripcion:
+        return None
+    match = PATRON_BOLETIN.search(descripcion)
+    if not match:
+        return None
+    numero, sufijo = match.groups()
+    return f"{numero}-{sufijo}" if sufijo else numero
+
+
+def shard_de_boletin(boletin):
+    """Nombre del shard exportado que contiene un boletín"""
+    return str(int(boletin.split('-')[0]) // TAMANO_SHARD)
+
+
+class IndiceBoletines:
+    """Agrupa las votaciones de cada proyecto de ley por boletín"""
+
+    def __init__(self, proyectos=None):
+        self.proyectos = proyectos or {}
+
+    @classmethod
+    def construir(cls, votaciones):
+        """
+        Construye el índice recorriendo las votaciones una sola vez
+
+        Args:
+            votaciones (list): Votaciones en formato del API
+
+        Returns:
+            IndiceBoletines: Índice construido
+        """
+        desenlaces = clasificar_votaciones(votaciones)
+        grupos = defaultdict(list)
+
+        for votacion, desenlace in zip(votaciones, desenlaces):
+            boletin = extraer_boletin(votacion.get('Descripcion'))
+            if boletin:
+                grupos[boletin].append((
+                    votacion.get('Fecha') or '',
+                    votacion.get('Id'),
+                    NOMBRES_DESENLACE[Desenlace(desenlace)]
+                ))
+
+        proyectos = {}
+        for boletin, votos in grupos.items():
+            # Cada proyecto tiene pocas votaciones: ordenarlas es prácticamente lineal
+            votos.sort()
+            fechas, ids, resultados = (list(c) for c in zip(*votos))
+            proyectos[boletin] = {
+                'boletin': boletin,
+                'total_votaciones': len(ids),
+                'primera_votacion': fechas[0][:10],
+                'ultima_votacion': fechas[-1][:10],
+                'aprobadas': resultados.count('aprobado'),
+                'rechazadas': resultados.count('rechazado'),
+                'resultado_final': resultados[-1],
+                'votaciones': ids,
+                'fechas': fechas,
+                'resultados': resultados,
+            }
+
+        return cls(proyectos)
+
+    def __len__(self):
+        return len(self.proyectos)
+
+    def __contains__(self, boletin):
+        return boletin in self.proyectos
+
+    def obtener(self, boletin):
+        """
+        Obtiene la línea de tiempo de un proyecto
+
+        Args:
+            boletin (str): Número de boletín (ej: '17286-05')
+
+        Returns:
+            dict: Datos del proyecto o None si no existe
+        """
+        return self.proyectos.get(boletin)
+
+    def buscar(self, desde=None, hasta=None, resultado_final=None):
+        """
+        Filtra proyectos por rango de fechas de votación y resultado final
+
+        Args:
+            desde (str): Fecha mínima de la última votación (YYYY-MM-DD)
+            hasta (str): Fecha máxima de la primera votación (YYYY-MM-DD)
+            resultado_final (str): 'aprobado', 'rechazado' u 'otro'
+
+        Returns:
+            list: Proyectos que cumplen los filtros
+        """
+        return [
+            p for p in self.proyectos.values()
+            if (desde is None or p['ultima_votacion'] >= desde)
+            and (hasta is None or p['primera_votacion'] <= hasta)
+            and (resultado_final is None or p['resultado_final'] == resultado_final)
+        ]
+
+    def resumen(self):
+        """
+        Lista compacta de todos los proyectos, sin las votaciones individuales
+
+        Returns:
+            list: Un diccionario de resumen por proyecto
+        """
+        return [
+            {k: v for k, v in p.items() if k not in ('votaciones', 'fechas', 'resultados')}
+            for p in self.proyectos.values()
+        ]
+
+    def shards(self):
+        """
+        Agrupa los proyectos por shard
+
+        Returns:
+            dict: Shard (int) -> {boletín: proyecto}
+        """
+        shards = defaultdict(dict)
+        for boletin, proyecto in self.proyectos.items():
+            shards[shard_de_boletin(boletin)][boletin] = proyecto
+        return dict(shards)
+
+    def datos_indice(self):
+        """
+        Contenido de indice.json: tamaño de shard y resumen de cada proyecto
+
+        Returns:
+            dict: Índice compacto
+        """
+        return {
+            'tamano_shard': TAMANO_SHARD,
+            'total_proyectos': len(self.proyectos),
+            'proyectos': self.resumen(),
+        }
+
+    def exportar(self, directorio='docs/data/boletines'):
+        """
+        Exporta el índice en shards por rango de número de boletín
+
+        Genera <directorio>/<shard>.json con las líneas de tiempo completas y
+        <directorio>/indice.json con el resumen de cada proyecto. Los shards
+        de una exportación anterior que ya no tienen proyectos se borran.
+
+        Args:
+            directorio (str): Directorio de salida
+
+        Returns:
+            int: Número de shards escritos
+        """
+        os.makedirs(directorio, exist_ok=True)
+
+        shards = self.shards()
+        for shard, proyectos in shards.items():
+            with open(f"{directorio}/{shard}.json", 'w', encoding='utf-8') as f:
+                json.dump(proyectos, f, ensure_ascii=False, separators=(',', ':'))
+
+        with open(f"{directorio}/indice.json", 'w', encoding='utf-8') as f:
+            json.dump(self.datos_indice(), f, ensure_ascii=False, separators=(',', ':'))
+
+        vigentes = {f"{shard}.json" for shard in shards}
+        for nombre in os.listdir(directorio):
+            if PATRON_SHARD.match(nombre) and nombre not in vigentes:
+                os.remove(f"{directorio}/{nombre}")
+
+        return len(shards)
+
+    @classmethod
+    def cargar(cls, directorio='docs/data/boletines'):
+        """
+        Carga un índice exportado previamente
+
+        Args:
+            directorio (str): Directorio con los shards
+
+        Returns:
+            IndiceBoletines: Índice cargado
+        """
+        proyectos = {}
+        for nombre in os.listdir(directorio):
+            if nombre.endswith('.json') and nombre != 'indice.json':
+                with open(f"{directorio}/{nombre}", 'r', encoding='utf-8') as f:
+                    proyectos.update(json.load(f))
+        return cls(proyectos)
+
+
+def main():
+    """Función principal para testing: construye el índice y mide su escalamiento"""
+    import glob
+    import time
+
+    votaciones = []
+    for archivo in sorted(glob.glob('data/raw/votaciones_*.json')):
+        with open(archivo, 'r', encoding='utf-8') as f:
+            votaciones.extend(json.load(f))
+
+    if not votaciones:
+        print("✗ No se encontraron archivos en data/raw/")
+        return
+
+    indice = IndiceBoletines.construir(votaciones)
+    print(f"✓ {len(indice):,} proyectos a partir de {len(votaciones):,} votaciones")
+
+    ejemplo = max(indice.proyectos.values(), key=lambda p: p['total_votaciones'])
+    print(f"\nProyecto con más votaciones: {ejemplo['boletin']}")
+    print(f"  • {ejemplo['total_votaciones']} votaciones "
+          f"entre {ejemplo['primera_votacion']} y {ejemplo['ultima_votacion']}")
+    print(f"  • Resultado final: {ejemplo['resultado_final']}")
+
+    # Escalamiento: el tiempo por votación debe mantenerse constante
+    print("\nBenchmark (copias del corpus con Ids y boletines desplazados):")
+    for factor in (1, 2, 4, 8):
+        corpus = [
+            dict(v, Id=f"{i}-{v['Id']}",
+                 Descripcion=v['Descripcion'].replace('N° ', f'N° {i}', 1) if i else v['Descripcion'])
+            for i in range(factor) for v in votaciones
+        ]
+        inicio = time.perf_counter()
+        indice = IndiceBoletines.construir(corpus)
+        duracion = time.perf_counter() - inicio
+        print(f"  {len(corpus):>8,} votaciones: {duracion:.3f}s "
+              f"({duracion / len(corpus) * 1e6:.2f} µs/votación, {len(indice):,} proyectos)")
+
+
+if __name__ == "__main__":
+    main()
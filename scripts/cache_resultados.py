@@ -0,0 +1,318 @@
+"""
+Caché en disco de los resultados de DataProcessor
+
+La clave de cada resultado combina el hash del contenido de los archivos
+de entrada, el nombre de la función, el código fuente de los módulos que
+calculan el resultado (MODULOS_ANALISIS, más VERSION_CACHE) y los
+parámetros: si un archivo anual o el análisis cambian, la clave cambia y
+el resultado se recalcula. Los resultados se guardan con pickle
+comprimido (zlib) y, al superar el tamaño máximo, se borran los menos
+usados recientemente (LRU, según la fecha de modificación, que se
+actualiza en cada acierto).
+
+El directorio es local (está en .gitignore): pickle puede ejecutar código
+al cargar, así que solo se leen resultados escritos por esta máquina.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import zlib
+
+from .parciales import TAMANO_CHUNK
+
+
+CACHE_DIR = 'data/processed/cache'
+CACHE_MAX_BYTES = 64 * 1024 ** 2
+
+EXTENSION = '.pkl.z'
+INDICE_HUELLAS = 'huellas.json'
+
+# Módulos (además del que define el método) de los que depende el resultado
+MODULOS_ANALISIS = ('cache_resultados', 'clasificacion', 'parciales', 'series')
+
+# Subir al cambiar algo que afecte a los resultados fuera de esos módulos
+VERSION_CACHE = 1
+
+
+class CacheResultados:
+    """Resultados de análisis en disco, con expulsión LRU por tamaño"""
+
+    def __init__(self, directorio=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        os.makedirs(directorio, exist_ok=True)
+        self._huellas = self._leer_huellas()
+        self._huellas_pendientes = False
+
+    def _leer_huellas(self):
+        try:
+            with open(os.path.join(self.directorio, INDICE_HUELLAS), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _guardar_huellas(self):
+        ruta = os.path.join(self.directorio, INDICE_HUELLAS)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self._huellas, f)
+        os.replace(temporal, ruta)
+
+    def huella_archivo(self, ruta):
+        """
+        Hash SHA-256 del contenido de un archivo
+
+        Se recuerda junto a su tamaño y fecha de modificación, de modo que
+        un archivo sin cambios no se vuelve a leer.
+
+        Args:
+            ruta (str): Archivo de entrada
+
+        Returns:
+            str: Hash hexadecimal del contenido
+        """
+        ruta = os.path.abspath(ruta)
+        estado = os.stat(ruta)
+        firma = [estado.st_size, estado.st_mtime_ns]
+
+        guardada = self._huellas.get(ruta)
+        if guardada and guardada[:2] == firma:
+            return guardada[2]
+
+        sha = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                sha.update(bloque)
+        self._huellas[ruta] = firma + [sha.hexdigest()]
+        self._huellas_pendientes = True
+        return sha.hexdigest()
+
+    def clave(self, funcion, rutas, parametros):
+        """
+        Clave de un resultado
+
+        Args:
+            funcion (callable): Función que produce el resultado
+            rutas (list): Archivos de entrada
+            parametros (dict): Parámetros de la llamada (serializables a JSON)
+
+        Returns:
+            str: Clave hexadecimal
+        """
+        contenido = json.dumps({
+            'funcion': funcion.__qualname__,
+            'codigo': huella_codigo(inspect.getsourcefile(funcion)),
+            'archivos': sorted(self.huella_archivo(r) for r in rutas),
+            'parametros': parametros
+        }, sort_keys=True, default=str)
+        if self._huellas_pendientes:
+            self._guardar_huellas()
+            self._huellas_pendientes = False
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()[:32]
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION)
+
+    def obtener(self, clave):
+        """
+        Args:
+            clave (str): Clave del resultado
+
+        Returns:
+            tuple: (encontrado, valor)
+        """
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                valor = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError):
+            self.fallos += 1
+            return False, None
+
+        # Marca de uso reciente para la expulsión LRU
+        os.utime(ruta)
+        self.aciertos += 1
+        return True, valor
+
+    def guardar(self, clave, valor):
+        """Guarda un resultado y expulsa los menos usados si se supera max_bytes"""
+        contenido = zlib.compress(pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL))
+        if len(contenido) > self.max_bytes:
+            return
+
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(contenido)
+        os.replace(temporal, ruta)
+        self._expulsar()
+
+    def _entradas(self):
+        """Resultados en disco: (fecha de uso, bytes, ruta), del menos al más reciente"""
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(EXTENSION):
+                ruta = os.path.join(self.directorio, nombre)
+                try:
+                    estado = os.stat(ruta)
+                except OSError:
+                    continue
+                entradas.append((estado.st_mtime_ns, estado.st_size, ruta))
+        return sorted(entradas)
+
+    def _expulsar(self):
+        entradas = self._entradas()
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in entradas:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+            total -= tamano
+
+    def tamano_bytes(self):
+        return sum(tamano for _, tamano, _ in self._entradas())
+
+    def limpiar(self):
+        """Borra todos los resultados guardados"""
+        for _, _, ruta in self._entradas():
+            os.remove(ruta)
+
+
+def memorizado(metodo):
+    """
+    Memoriza un método de DataProcessor cuya entrada viene de archivos
+
+    Se aplica cuando el primer argumento conoce sus archivos de origen
+    (un LectorChunks de cargar_votaciones, o una lista de nombres de
+    archivo) y el procesador tiene caché. Un DataFrame ya cargado no se
+    memoriza: calcular su hash cuesta casi lo mismo que el análisis.
+
+    Los nombres de archivo se convierten en un LectorChunks antes de
+    llamar al método, haya caché o no, salvo en los métodos que reciben
+    su propio tamano_chunk (procesar_por_chunks), que ya leen los nombres.
+    """
+    firma = inspect.signature(metodo)
+    nombre_entrada = list(firma.parameters)[1]
+    lee_nombres = 'tamano_chunk' in firma.parameters
+
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        llamada = firma.bind(self, *args, **kwargs)
+        llamada.apply_defaults()
+        entrada = llamada.arguments[nombre_entrada]
+        rutas = _rutas_de_origen(self, entrada)
+
+        if rutas is not None and not lee_nombres and not hasattr(entrada, 'rutas'):
+            entrada = self.cargar_votaciones(entrada, tamano_chunk=TAMANO_CHUNK)
+            llamada.arguments[nombre_entrada] = entrada
+
+        cache = getattr(self, 'cache', None)
+        if cache is None or rutas is None:
+            return metodo(*llamada.args, **llamada.kwargs)
+
+        parametros = {k: v for k, v in llamada.arguments.items() if k not in ('self', nombre_entrada)}
+        if hasattr(entrada, 'tamano_chunk'):
+            parametros['tamano_chunk'] = entrada.tamano_chunk
+        parametros['memoria_maxima'] = self.memoria_maxima
+
+        clave = cache.clave(metodo, rutas, parametros)
+        encontrado, valor = cache.obtener(clave)
+        if not encontrado:
+            valor = metodo(*llamada.args, **llamada.kwargs)
+            cache.guardar(clave, valor)
+        return valor
+
+    return envoltura
+
+
+@functools.lru_cache(maxsize=None)
+def huella_codigo(archivo_metodo):
+    """
+    Hash del código que calcula un resultado memorizado
+
+    Args:
+        archivo_metodo (str): Archivo fuente del método memorizado
+
+    Returns:
+        str: Hash hexadecimal de VERSION_CACHE y del código fuente del
+            archivo y de MODULOS_ANALISIS
+    """
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    archivos = {os.path.abspath(archivo_metodo)}
+    archivos.update(os.path.join(directorio, f"{m}.py") for m in MODULOS_ANALISIS)
+
+    sha = hashlib.sha256(str(VERSION_CACHE).encode('ascii'))
+    for archivo in sorted(archivos):
+        with open(archivo, 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()
+
+
+def _rutas_de_origen(processor, entrada):
+    """Archivos de los que proviene la entrada, o None si no se conocen"""
+    rutas = getattr(entrada, 'rutas', None)
+    if rutas is not None:
+        return list(rutas)
+    if isinstance(entrada, str):
+        entrada = [entrada]
+    if isinstance(entrada, (list, tuple)) and entrada and all(isinstance(e, str) for e in entrada):
+        return [f"{processor.input_dir}/{e}" for e in entrada]
+    return None
+
+
+def main():
+    """Benchmark: análisis en frío, desde caché y tras cambiar un archivo anual"""
+    import glob
+    import shutil
+    import tempfile
+    import time
+
+    from .data_processor import DataProcessor
+
+    archivos = sorted(glob.glob('data/raw/votaciones_*.json'))
+    if not archivos:
+        print("✗ No se encontraron archivos en data/raw/")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        entrada = os.path.join(tmp, 'raw')
+        os.makedirs(entrada)
+        for archivo in archivos:
+            shutil.copy(archivo, entrada)
+        nombres = [os.path.basename(a) for a in archivos]
+        processor = DataProcessor(entrada, os.path.join(tmp, 'processed'))
+
+        def medir(etiqueta):
+            aciertos = processor.cache.aciertos
+            inicio = time.perf_counter()
+            lector = processor.cargar_votaciones(nombres, tamano_chunk=5000)
+            processor.generar_estadisticas_generales(lector)
+            processor.generar_resumen_anual(lector)
+            processor.procesar_por_chunks(nombres)
+            duracion = time.perf_counter() - inicio
+            print(f"  {etiqueta:<34} {duracion * 1000:8.1f} ms  "
+                  f"({processor.cache.aciertos - aciertos}/3 desde caché)")
+
+        print(f"{len(nombres)} archivos anuales")
+        medir('en frío')
+        medir('repetido')
+
+        # Un archivo anual cambia: solo cambian las claves que lo incluyen
+        ultimo = os.path.join(entrada, nombres[-1])
+        with open(ultimo, 'r', encoding='utf-8') as f:
+            votaciones = json.load(f)
+        with open(ultimo, 'w', encoding='utf-8') as f:
+            json.dump(votaciones[:-1], f, ensure_ascii=False, indent=2)
+        medir(f"tras cambiar {nombres[-1]}")
+        medir('repetido')
+
+        print(f"  caché en disco: {processor.cache.tamano_bytes() / 1024:.1f} KB")
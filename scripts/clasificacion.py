@@ -0,0 +1,249 @@
+"""
+Normalización de resultado, tipo y quórum de las votaciones
+
+El API entrega junto a cada etiqueta un código numérico (atributo 'Valor').
+Las etiquetas cambian entre años ('Unánime' en 2002-2004 vs 'Aprobado' después),
+los códigos no. Aquí los códigos se mapean a enteros y la clasificación
+aprobado/rechazado se resuelve con una tabla de búsqueda vectorizada.
+"""
+
+from enum import IntEnum
+
+import numpy as np
+
+
+class Resultado(IntEnum):
+    """Códigos de Resultado_Valor"""
+    RECHAZADO = 0
+    APROBADO = 1
+    UNANIME = 2
+    EMPATE = 3
+    SIN_QUORUM = 4
+    SIN_RESULTADO = 9
+
+
+class TipoVotacion(IntEnum):
+    """Códigos de Tipo_Valor"""
+    PROYECTO_DE_LEY = 1
+    PROYECTO_DE_RESOLUCION = 2
+    PROYECTO_DE_ACUERDO = 3
+    OTROS = 4
+
+
+class Quorum(IntEnum):
+    """Códigos de Quorum_Valor"""
+    SIMPLE = 1
+    CALIFICADO = 2
+    REFORMA_CONSTITUCIONAL_2_3 = 3
+    REFORMA_CONSTITUCIONAL_3_5 = 4
+    LEY_ORGANICA_CONSTITUCIONAL = 5
+    TRES_QUINTOS = 7
+    DOS_QUINTOS = 8
+    UN_TERCIO = 9
+    DOS_TERCIOS = 10
+    REFORMA_CONSTITUCIONAL_4_7 = 11
+
+
+class Desenlace(IntEnum):
+    """Clasificación final de una votación"""
+    RECHAZADO = 0
+    APROBADO = 1
+    OTRO = 2
+    DESCONOCIDO = 3
+
+
+# Código usado cuando el campo falta o no es numérico
+CODIGO_NULO = -1
+
+# Desenlace por código de resultado. La última posición recoge
+# cualquier código fuera de rango (incluido CODIGO_NULO).
+_DESENLACE_POR_RESULTADO = np.full(max(Resultado) + 2, Desenlace.DESCONOCIDO, dtype=np.int8)
+_DESENLACE_POR_RESULTADO[Resultado.RECHAZADO] = Desenlace.RECHAZADO
+_DESENLACE_POR_RESULTADO[Resultado.APROBADO] = Desenlace.APROBADO
+_DESENLACE_POR_RESULTADO[Resultado.UNANIME] = Desenlace.APROBADO
+_DESENLACE_POR_RESULTADO[Resultado.EMPATE] = Desenlace.OTRO
+_DESENLACE_POR_RESULTADO[Resultado.SIN_QUORUM] = Desenlace.OTRO
+_DESENLACE_POR_RESULTADO[Resultado.SIN_RESULTADO] = Desenlace.OTRO
+
+# Campo del API -> nombre de la columna codificada
+CAMPOS_CODIFICADOS = {
+    'Resultado_Valor': 'resultado_cod',
+    'Tipo_Valor': 'tipo_cod',
+    'Quorum_Valor': 'quorum_cod',
+}
+
+
+def _a_codigo(valor):
+    """Convierte un 'Valor' del API a entero, o CODIGO_NULO si no es válido"""
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return CODIGO_NULO
+
+
+def codificar_campo(votaciones, campo):
+    """
+    Codifica un campo *_Valor de una lista de votaciones
+
+    Args:
+        votaciones (list): Lista de diccionarios con votaciones
+        campo (str): Campo a codificar (ej: 'Resultado_Valor')
+
+    Returns:
+        np.ndarray: Códigos enteros (int16), uno por votación
+    """
+    return np.fromiter(
+        (_a_codigo(v.get(campo)) for v in votaciones),
+        dtype=np.int16,
+        count=len(votaciones)
+    )
+
+
+def desenlace(codigos_resultado):
+    """
+    Clasifica códigos de resultado en aprobado/rechazado/otro
+
+    Args:
+        codigos_resultado (array-like): Códigos de Resultado_Valor
+
+    Returns:
+        np.ndarray: Valores de Desenlace (int8)
+    """
+    codigos = np.asarray(codigos_resultado, dtype=np.int16)
+    fuera_de_rango = len(_DESENLACE_POR_RESULTADO) - 1
+    indices = np.where(
+        (codigos >= 0) & (codigos < fuera_de_rango),
+        codigos,
+        fuera_de_rango
+    )
+    return _DESENLACE_POR_RESULTADO[indices]
+
+
+def desenlace_de_serie(serie):
+    """
+    Clasifica una columna Resultado_Valor de un DataFrame
+
+    Args:
+        serie (pd.Series): Códigos como texto (formato del API) o ya numéricos;
+            los vacíos o no numéricos cuentan como CODIGO_NULO
+
+    Returns:
+        np.ndarray: Valores de Desenlace (int8), uno por fila
+    """
+    import pandas as pd
+
+    codigos = pd.to_numeric(serie, errors='coerce').fillna(CODIGO_NULO)
+    return desenlace(codigos.to_numpy(dtype=np.int16))
+
+
+def a_numerico(serie):
+    """
+    Convierte una columna de texto (formato del API) a float
+
+    La conversión directa es varias veces más rápida que pd.to_numeric;
+    solo si falla (valores vacíos o no numéricos) se usa la versión tolerante.
+
+    Args:
+        serie (pd.Series): Columna a convertir
+
+    Returns:
+        np.ndarray: float64, con NaN para vacíos o no numéricos
+    """
+    try:
+        return serie.astype(np.float64).to_numpy()
+    except (ValueError, TypeError):
+        import pandas as pd
+
+        return pd.to_numeric(serie, errors='coerce').to_numpy(dtype=float)
+
+
+def clasificar_votaciones(votaciones):
+    """
+    Clasifica una lista de votaciones (formato JSON del API)
+
+    Args:
+        votaciones (list): Lista de diccionarios con votaciones
+
+    Returns:
+        np.ndarray: Valores de Desenlace, uno por votación
+    """
+    return desenlace(codificar_campo(votaciones, 'Resultado_Valor'))
+
+
+def codificar_dataframe(df):
+    """
+    Añade al DataFrame las columnas codificadas y el desenlace
+
+    Args:
+        df (pd.DataFrame): DataFrame con votaciones
+
+    Returns:
+        pd.DataFrame: El mismo DataFrame con columnas *_cod y 'desenlace'
+    """
+    import pandas as pd
+
+    for campo, columna in CAMPOS_CODIFICADOS.items():
+        if campo in df.columns:
+            df[columna] = (
+                pd.to_numeric(df[campo], errors='coerce')
+                .fillna(CODIGO_NULO)
+                .astype(np.int16)
+            )
+
+    if 'resultado_cod' in df.columns:
+        df['desenlace'] = desenlace(df['resultado_cod'].to_numpy())
+
+    return df
+
+
+def main():
+    """Función principal para testing: verifica la clasificación con los datos incluidos"""
+    import glob
+    import json
+    import os
+
+    archivos = sorted(glob.glob('data/raw/votaciones_*.json'))
+    if not archivos:
+        print("✗ No se encontraron archivos en data/raw/")
+        return
+
+    errores = 0
+    for archivo in archivos:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            votaciones = json.load(f)
+
+        desenlaces = clasificar_votaciones(votaciones)
+
+        # Referencia: clasificación por etiqueta, voto a voto
+        for v, d in zip(votaciones, desenlaces):
+            etiqueta = (v.get('Resultado') or '').lower()
+            esperado = (
+                Desenlace.APROBADO if etiqueta in ('aprobado', 'unánime')
+                else Desenlace.RECHAZADO if etiqueta == 'rechazado'
+                else Desenlace.OTRO
+            )
+            if d != esperado:
+                errores += 1
+
+        # Los códigos deben mapear a una sola etiqueta por campo
+        for campo in CAMPOS_CODIFICADOS:
+            etiquetas = {}
+            for v in votaciones:
+                etiquetas.setdefault(v.get(campo), set()).add(v.get(campo.replace('_Valor', '')))
+            ambiguos = {c: e for c, e in etiquetas.items() if len(e) > 1}
+            if ambiguos:
+                errores += 1
+                print(f"  ✗ {archivo}: {campo} ambiguo: {ambiguos}")
+
+        print(f"  {os.path.basename(archivo)}: "
+              f"{np.count_nonzero(desenlaces == Desenlace.APROBADO)} aprobados, "
+              f"{np.count_nonzero(desenlaces == Desenlace.RECHAZADO)} rechazados")
+
+    if errores:
+        print(f"\n✗ {errores} discrepancias")
+    else:
+        print(f"\n✓ Clasificación consistente en {len(archivos)} años")
+
+
+if __name__ == "__main__":
+    main()
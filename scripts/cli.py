@@ -0,0 +1,321 @@
+"""
+Interfaz de línea de comandos del proyecto
+
+    python -m scripts fetch      Consulta el API y publica los datos del sitio
+    python -m scripts parse      Parsea archivos XML locales (.xml o .xml.gz)
+    python -m scripts rebuild    Regenera todo desde el archivo comprimido, sin red
+    python -m scripts stats      Muestra los datos publicados y el estado del archivo
+    python -m scripts export     Regenera docs/data desde data/raw/votaciones_*.json
+    python -m scripts bench      Ejecuta los benchmarks
+    python -m scripts sintetico  Genera un corpus sintético N veces mayor que el real
+    python -m scripts stub       Sirve un archivo XML imitando el API, sin red
+
+Este módulo solo importa la biblioteca estándar. Cada subcomando importa
+sus dependencias (pandas, numpy, requests) al ejecutarse, de modo que los
+comandos livianos como 'stats' no pagan su tiempo de carga.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def _rango_annos(texto):
+    """Convierte '2001-2025' o '2024' en lista de años"""
+    inicio, _, fin = texto.partition('-')
+    inicio, fin = int(inicio), int(fin or inicio)
+    if inicio > fin:
+        raise argparse.ArgumentTypeError(f"rango invertido '{texto}' (usa '{fin}-{inicio}')")
+    return list(range(inicio, fin + 1))
+
+
+def comando_fetch(args):
+    """Consulta el API; para votaciones además valida y publica"""
+    if args.endpoint == 'votaciones':
+        from .update_data import main as actualizar
+        publicado = actualizar(annos=args.annos, workers=args.workers, forzar=args.forzar,
+                               raw_dir=args.raw_dir, site_dir=args.site_dir)
+        return 0 if publicado else 1
+
+    from .api_client import CamaraAPI
+    from .endpoints import obtener_esquema
+
+    esquema = obtener_esquema(args.endpoint)
+    if not esquema['params']:
+        lista_params = [{}]
+    elif list(esquema['params']) == ['anno']:
+        lista_params = [{'anno': anno} for anno in (args.annos or range(2001, 2026))]
+    else:
+        print(f"✗ '{args.endpoint}' requiere parámetros {list(esquema['params'])}; "
+              f"usa CamaraAPI.descargar desde Python")
+        return 1
+
+    api = CamaraAPI(output_dir=args.raw_dir)
+    resultados = api.descargar(args.endpoint, lista_params, workers=args.workers)
+    total = sum(len(registros) for _, registros in resultados)
+    print(f"\n✅ {total:,} registros de '{args.endpoint}'")
+    return 0
+
+
+def comando_parse(args):
+    """Parsea en streaming archivos XML locales"""
+    from .endpoints import iterar_registros_xml, obtener_esquema
+
+    esquema = obtener_esquema(args.endpoint)
+    todos = []
+    for ruta in args.archivos:
+        registros = list(iterar_registros_xml(ruta, esquema))
+        print(f"✓ {len(registros):,} registros en {ruta}")
+        todos.extend(registros)
+
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            json.dump(todos, f, ensure_ascii=False, indent=2)
+        print(f"✓ JSON guardado en: {args.salida}")
+    elif todos:
+        print("\nPrimer registro:")
+        for key, value in todos[0].items():
+            print(f"  • {key}: {value}")
+    return 0
+
+
+def comando_rebuild(args):
+    """Regenera los JSON por año y el sitio desde el archivo comprimido"""
+    from .update_data import cargar_votaciones_raw, publicar, reconstruir_desde_archivo
+
+    reconstruidas = reconstruir_desde_archivo(workers=args.workers,
+                                              archivo_dir=f"{args.raw_dir}/archivo",
+                                              output_dir=args.raw_dir)
+    if not reconstruidas:
+        return 1
+
+    # Se publican también los años sin versión archivada, como en 'fetch'
+    votaciones = cargar_votaciones_raw(args.raw_dir)
+    print(f"\n📦 Corpus a publicar: {len(votaciones):,} votaciones "
+          f"({len(reconstruidas):,} reconstruidas)")
+    return 0 if publicar(votaciones, forzar=args.forzar, directorio=args.site_dir) else 1
+
+
+def comando_export(args):
+    """Regenera docs/data a partir de los JSON por año ya descargados"""
+    from .update_data import cargar_votaciones_raw, publicar
+
+    votaciones = cargar_votaciones_raw(args.directorio)
+    if not votaciones:
+        print(f"✗ No se encontraron votaciones en {args.directorio}/")
+        return 1
+    return 0 if publicar(votaciones, forzar=args.forzar, directorio=args.site_dir) else 1
+
+
+def comando_stats(args):
+    """Resumen de los datos publicados y del archivo comprimido (sin dependencias pesadas)"""
+    from .archivo import ArchivoXML
+    from .endpoints import ENDPOINTS
+
+    ruta_stats = 'docs/data/estadisticas.json'
+    if os.path.exists(ruta_stats):
+        with open(ruta_stats, 'r', encoding='utf-8') as f:
+            stats = json.load(f)
+        print(f"📊 Datos publicados ({stats.get('fecha_actualizacion', '-')})")
+        print(f"  • Total votaciones: {stats.get('total_votaciones', 0):,}")
+        periodo = stats.get('periodo', {})
+        print(f"  • Periodo: {periodo.get('inicio')} - {periodo.get('fin')}")
+        for anio, s in sorted(stats.get('por_anio', {}).items()):
+            print(f"    {anio}: {s['total']:>6,} total, {s['aprobados']:>6,} aprobados, "
+                  f"{s['rechazados']:>6,} rechazados")
+    else:
+        print(f"⚠️  No hay datos publicados en {ruta_stats}")
+
+    archivo = ArchivoXML(args.archivo)
+    print(f"\n🗄️  Archivo comprimido ({args.archivo})")
+    for nombre, esquema in ENDPOINTS.items():
+        claves = archivo.claves(esquema['operacion'])
+        if claves:
+            ultima = os.path.basename(archivo.ultima_version(esquema['operacion'], claves[-1]))
+            print(f"  • {nombre}: {len(claves)} consultas ({claves[0]} - {claves[-1]}), "
+                  f"última versión {ultima}")
+        else:
+            print(f"  • {nombre}: sin versiones archivadas")
+    return 0
+
+
+def _medir_arranque(repeticiones=5):
+    """Mide el tiempo de arranque de comandos en subprocesos nuevos"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    casos = [
+        ('python (sin imports)', [sys.executable, '-c', 'pass']),
+        ('python -m scripts stats', [sys.executable, '-m', 'scripts', 'stats']),
+        ('import requests', [sys.executable, '-c', 'import requests']),
+        ('import numpy', [sys.executable, '-c', 'import numpy']),
+        ('import pandas', [sys.executable, '-c', 'import pandas']),
+    ]
+
+    print("Tiempo de arranque (mejor de "
+          f"{repeticiones}, incluye el intérprete):")
+    for nombre, comando in casos:
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            subprocess.run(comando, cwd=raiz, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, check=False)
+            tiempos.append(time.perf_counter() - inicio)
+        print(f"  {nombre:<26} {min(tiempos) * 1000:7.1f} ms")
+
+
+def comando_bench(args):
+    """Ejecuta los benchmarks incluidos en los módulos"""
+    for nombre in args.benchmarks:
+        print("\n" + "="*70)
+        print(f"BENCHMARK: {nombre}")
+        print("="*70)
+        if nombre == 'arranque':
+            _medir_arranque()
+        elif nombre == 'clasificacion':
+            from .clasificacion import main as bench
+            bench()
+        elif nombre == 'validacion':
+            from .validacion import main as bench
+            bench()
+        elif nombre == 'boletines':
+            from .boletines import main as bench
+            bench()
+        elif nombre == 'cache':
+            from .cache_resultados import main as bench
+            bench()
+        elif nombre == 'series':
+            from .series import main as bench
+            bench()
+        elif nombre == 'sintetico':
+            from .sintetico import main as bench
+            bench()
+        elif nombre == 'carga':
+            from .stub_api import main as bench
+            bench()
+    return 0
+
+
+def comando_sintetico(args):
+    """Genera un corpus sintético (JSON por año y archivo XML)"""
+    from .sintetico import generar
+
+    generados = generar(escala=args.escala, semilla=args.semilla, salida=args.salida,
+                        directorio=args.directorio, formatos=args.formatos, annos=args.annos)
+    return 0 if generados else 1
+
+
+def comando_stub(args):
+    """Sirve un archivo XML en local imitando el API de la Cámara"""
+    from .stub_api import crear_servidor
+
+    if not os.path.isdir(args.directorio):
+        print(f"✗ No existe el archivo {args.directorio}/")
+        return 1
+
+    servidor = crear_servidor(args.directorio, puerto=args.puerto, host=args.host,
+                              latencia=args.latencia, jitter=args.jitter,
+                              tasa_error=args.tasa_error, semilla=args.semilla,
+                              verbose=args.verbose)
+    print(f"✓ Sirviendo {args.directorio}/ en {servidor.url}")
+    print(f"  CAMARA_API_URL={servidor.url} python -m scripts fetch")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    print(f"\n{servidor.peticiones} peticiones, {servidor.bytes_enviados / 1024 ** 2:.1f} MB enviados")
+    return 0
+
+
+BENCHMARKS = ['arranque', 'clasificacion', 'validacion', 'boletines', 'cache', 'series',
+              'sintetico', 'carga']
+
+
+def crear_parser():
+    """Construye el parser de argumentos con todos los subcomandos"""
+    parser = argparse.ArgumentParser(
+        prog='python -m scripts',
+        description='Seguimiento Legislativo Chile - datos de la Cámara de Diputados'
+    )
+    sub = parser.add_subparsers(dest='comando', required=True)
+
+    p = sub.add_parser('fetch', help='Consulta el API (votaciones: además valida y publica)')
+    p.add_argument('--endpoint', default='votaciones',
+                   help='Endpoint registrado en scripts/endpoints.py')
+    p.add_argument('--annos', type=_rango_annos, default=None,
+                   help="Años a consultar, ej: '2024' o '2001-2025'")
+    p.add_argument('--workers', type=int, default=4, help='Consultas simultáneas al API')
+    p.add_argument('--forzar', action='store_true',
+                   help='Publicar aunque la validación encuentre errores')
+    p.add_argument('--raw-dir', default='data/raw',
+                   help='Directorio de los JSON por año y del archivo comprimido')
+    p.add_argument('--site-dir', default='docs/data', help='Directorio de datos del sitio')
+    p.set_defaults(func=comando_fetch)
+
+    p = sub.add_parser('parse', help='Parsea archivos XML locales')
+    p.add_argument('archivos', nargs='+', help='Archivos .xml o .xml.gz')
+    p.add_argument('--endpoint', default='votaciones')
+    p.add_argument('--salida', help='Guardar los registros en este JSON')
+    p.set_defaults(func=comando_parse)
+
+    p = sub.add_parser('rebuild', help='Regenera todo desde el archivo comprimido, sin red')
+    p.add_argument('--workers', type=int, default=None,
+                   help='Procesos (por defecto uno por núcleo)')
+    p.add_argument('--forzar', action='store_true')
+    p.add_argument('--raw-dir', default='data/raw',
+                   help='Directorio de los JSON por año (el archivo está en <raw-dir>/archivo)')
+    p.add_argument('--site-dir', default='docs/data', help='Directorio de datos del sitio')
+    p.set_defaults(func=comando_rebuild)
+
+    p = sub.add_parser('stats', help='Resumen de los datos publicados y del archivo')
+    p.add_argument('--archivo', default='data/raw/archivo')
+    p.set_defaults(func=comando_stats)
+
+    p = sub.add_parser('export', help='Regenera docs/data desde data/raw/votaciones_*.json')
+    p.add_argument('--directorio', default='data/raw')
+    p.add_argument('--forzar', action='store_true')
+    p.add_argument('--site-dir', default='docs/data', help='Directorio de datos del sitio')
+    p.set_defaults(func=comando_export)
+
+    p = sub.add_parser('bench', help='Ejecuta los benchmarks')
+    p.add_argument('benchmarks', nargs='*', choices=BENCHMARKS, default=BENCHMARKS)
+    p.set_defaults(func=comando_bench)
+
+    p = sub.add_parser('sintetico', help='Genera un corpus sintético N veces mayor que el real')
+    p.add_argument('--escala', type=int, default=10, help='Factor de volumen por año (10 a 1000)')
+    p.add_argument('--semilla', type=int, default=42)
+    p.add_argument('--salida', default=None,
+                   help='Directorio de salida (por defecto data/sintetico/x<escala>)')
+    p.add_argument('--directorio', default='data/raw', help='JSON reales de los que aprender')
+    p.add_argument('--formatos', nargs='+', choices=['json', 'xml'], default=['json', 'xml'])
+    p.add_argument('--annos', type=_rango_annos, default=None,
+                   help="Años a generar, ej: '2024' o '2018-2025'")
+    p.set_defaults(func=comando_sintetico)
+
+    p = sub.add_parser('stub', help='Sirve un archivo XML imitando el API, sin red')
+    p.add_argument('--directorio', default='data/raw/archivo',
+                   help='Archivo XML a servir (real o sintético)')
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--puerto', type=int, default=8765)
+    p.add_argument('--latencia', type=float, default=0.0, help='Segundos de demora por petición')
+    p.add_argument('--jitter', type=float, default=0.0, help='Demora adicional aleatoria máxima')
+    p.add_argument('--tasa-error', type=float, default=0.0,
+                   help='Fracción de peticiones que responden 503')
+    p.add_argument('--semilla', type=int, default=0)
+    p.add_argument('--verbose', action='store_true', help='Registrar cada petición')
+    p.set_defaults(func=comando_stub)
+
+    return parser
+
+
+def main(argv=None):
+    """Punto de entrada de la CLI"""
+    args = crear_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,26 +7,49 @@ import pandas as pd
 from datetime import datetime
 from collections import Counter
 import os
+import sys
+
+from .cache_resultados import CACHE_MAX_BYTES, CacheResultados, memorizado
+from .clasificacion import Desenlace, codificar_dataframe, desenlace_de_serie
+from .series import SeriesTemporales
+from .parciales import (
+    MEMORIA_MAXIMA, TAMANO_CHUNK, ActividadParlamentariaParcial,
+    EstadisticasParciales, LectorChunks, ResumenAnualParcial
+)
 
 
 class DataProcessor:
     """Procesa datos legislativos para análisis y visualización"""
     
-    def __init__(self, input_dir='data/raw', output_dir='data/processed'):
+    def __init__(self, input_dir='data/raw', output_dir='data/processed',
+                 memoria_maxima=MEMORIA_MAXIMA, usar_cache=True, cache_max_bytes=CACHE_MAX_BYTES):
         self.input_dir = input_dir
         self.output_dir = output_dir
+        self.memoria_maxima = memoria_maxima
         os.makedirs(output_dir, exist_ok=True)
+        
+        # Resultados de entradas leídas desde archivos (ver cache_resultados.py)
+        self.cache = (
+            CacheResultados(os.path.join(output_dir, 'cache'), cache_max_bytes)
+            if usar_cache else None
+        )
     
-    def cargar_votaciones(self, filename):
+    def cargar_votaciones(self, filename, tamano_chunk=None):
         """
         Carga votaciones desde JSON
         
         Args:
-            filename (str): Nombre del archivo JSON
+            filename (str | list): Nombre del archivo JSON (o lista, en modo por bloques)
+            tamano_chunk (int): Si se indica, devuelve un LectorChunks (bloques
+                tipados de ese tamaño) en vez de un DataFrame completo
             
         Returns:
-            pd.DataFrame: DataFrame con votaciones
+            pd.DataFrame: DataFrame con votaciones (o LectorChunks)
         """
+        if tamano_chunk:
+            filenames = [filename] if isinstance(filename, str) else list(filename)
+            return LectorChunks([f"{self.input_dir}/{f}" for f in filenames], tamano_chunk)
+        
         filepath = f"{self.input_dir}/{filename}"
         
         try:
@@ -41,17 +64,88 @@ class DataProcessor:
             print(f"✗ Error cargando {filename}: {e}")
             return pd.DataFrame()
     
+    def clasificar_votaciones(self, df):
+        """
+        Añade columnas codificadas (resultado/tipo/quórum) y el desenlace
+        
+        Args:
+            df (pd.DataFrame): DataFrame con votaciones
+            
+        Returns:
+            pd.DataFrame: DataFrame con columnas *_cod y 'desenlace'
+        """
+        return codificar_dataframe(df)
+    
+    def _acumular(self, chunks, *parciales):
+        """
+        Alimenta los acumuladores bloque a bloque sin superar memoria_maxima
+        
+        El presupuesto de los acumuladores es el techo menos lo que ocupa el
+        bloque en proceso; si lo exceden, reducen su estado (ver parciales.py).
+        """
+        avisado = False
+        for chunk in chunks:
+            for parcial in parciales:
+                parcial.agregar(chunk)
+            
+            memoria_chunk = int(chunk.memory_usage(deep=True).sum())
+            presupuesto = self.memoria_maxima - memoria_chunk
+            if presupuesto <= 0 and not avisado:
+                print(f"⚠ Un bloque ocupa {memoria_chunk / 1024**2:.1f} MB, más que el techo "
+                      f"de {self.memoria_maxima / 1024**2:.1f} MB: usa un tamano_chunk menor")
+                avisado = True
+            for parcial in parciales:
+                parcial.ajustar_memoria(max(presupuesto, 0) / len(parciales))
+        return parciales
+    
+    @memorizado
+    def procesar_por_chunks(self, filenames, tamano_chunk=TAMANO_CHUNK, campo_parlamentario=None):
+        """
+        Estadísticas generales, resumen anual y (opcional) actividad por
+        parlamentario en una sola pasada por bloques sobre varios archivos
+        
+        Args:
+            filenames (list): Archivos JSON en input_dir
+            tamano_chunk (int): Filas por bloque
+            campo_parlamentario (str): Campo del parlamentario, si los datos lo tienen
+            
+        Returns:
+            dict: 'estadisticas', 'resumen_anual' y 'parlamentarios' (si se pidió)
+        """
+        parciales = {
+            'estadisticas': EstadisticasParciales(),
+            'resumen_anual': ResumenAnualParcial()
+        }
+        if campo_parlamentario:
+            parciales['parlamentarios'] = ActividadParlamentariaParcial(campo_parlamentario)
+        
+        self._acumular(self.cargar_votaciones(filenames, tamano_chunk), *parciales.values())
+        return {nombre: parcial.resultado() for nombre, parcial in parciales.items()}
+    
+    def _desenlaces(self, df):
+        """Desenlace por votación sin modificar el DataFrame, o None si no hay códigos"""
+        if 'desenlace' in df.columns:
+            return df['desenlace'].to_numpy()
+        if 'Resultado_Valor' not in df.columns:
+            return None
+        return desenlace_de_serie(df['Resultado_Valor'])
+    
+    @memorizado
     def analizar_parlamentario(self, df, campo_parlamentario='Diputado'):
         """
         Analiza actividad por parlamentario
         
         Args:
-            df (pd.DataFrame): DataFrame con votaciones
+            df (pd.DataFrame): DataFrame con votaciones (o iterador de bloques)
             campo_parlamentario (str): Nombre del campo con info del parlamentario
             
         Returns:
             pd.DataFrame: Estadísticas por parlamentario
         """
+        if not isinstance(df, pd.DataFrame):
+            parcial, = self._acumular(df, ActividadParlamentariaParcial(campo_parlamentario))
+            return parcial.resultado()
+        
         if campo_parlamentario not in df.columns:
             print(f"✗ Campo '{campo_parlamentario}' no encontrado")
             print(f"Campos disponibles: {df.columns.tolist()}")
@@ -72,16 +166,21 @@ class DataProcessor:
         
         return stats.reset_index()
     
+    @memorizado
     def generar_estadisticas_generales(self, df):
         """
         Genera estadísticas generales del dataset
         
         Args:
-            df (pd.DataFrame): DataFrame con votaciones
+            df (pd.DataFrame): DataFrame con votaciones (o iterador de bloques)
             
         Returns:
             dict: Estadísticas generales
         """
+        if not isinstance(df, pd.DataFrame):
+            parcial, = self._acumular(df, EstadisticasParciales())
+            return parcial.resultado()
+        
         stats = {
             'total_votaciones': len(df),
             'columnas': df.columns.tolist(),
@@ -103,6 +202,15 @@ class DataProcessor:
             except:
                 pass
         
+        # Conteo por desenlace (según código de resultado)
+        desenlaces = self._desenlaces(df)
+        if desenlaces is not None:
+            stats['desenlaces'] = {
+                'aprobados': int((desenlaces == Desenlace.APROBADO).sum()),
+                'rechazados': int((desenlaces == Desenlace.RECHAZADO).sum()),
+                'otros': int((desenlaces == Desenlace.OTRO).sum())
+            }
+        
         # Resumen de cada campo
         for col in df.columns:
             stats['resumen_campos'][col] = {
@@ -118,25 +226,41 @@ class DataProcessor:
         Prepara datos en formato óptimo para visualización web
         
         Args:
-            df (pd.DataFrame): DataFrame con datos
+            df (pd.DataFrame): DataFrame con datos (o iterador de bloques)
             filename (str): Nombre del archivo de salida
             
         Returns:
             dict: Datos preparados para visualización
         """
+        if not isinstance(df, pd.DataFrame):
+            # Por bloques: se guardan solo las primeras 1000 filas y se cuenta el resto
+            primeras, total, columnas = [], 0, []
+            for chunk in df:
+                if not columnas:
+                    columnas = chunk.columns.tolist()
+                faltan = 1000 - sum(len(p) for p in primeras)
+                if faltan > 0:
+                    primeras.append(chunk.head(faltan))
+                total += len(chunk)
+            muestra = pd.concat(primeras) if primeras else pd.DataFrame()
+            datos = json.loads(muestra.to_json(orient='records', date_format='iso'))
+        else:
+            total, columnas = len(df), df.columns.tolist()
+            datos = None
+        
         # Generar diferentes vistas de datos
         data_viz = {
             'metadata': {
                 'fecha_generacion': datetime.now().isoformat(),
-                'total_registros': len(df),
-                'columnas': df.columns.tolist()
+                'total_registros': total,
+                'columnas': columnas
             },
             'datos': []
         }
         
         # Convertir DataFrame a lista de diccionarios
         # Limitar a primeros 1000 registros para no sobrecargar el frontend
-        data_viz['datos'] = df.head(1000).to_dict('records')
+        data_viz['datos'] = datos if datos is not None else df.head(1000).to_dict('records')
         
         # Guardar
         output_path = f"{self.output_dir}/{filename}"
@@ -149,17 +273,22 @@ class DataProcessor:
             print(f"✗ Error guardando datos de visualización: {e}")
             return None
     
+    @memorizado
     def generar_resumen_anual(self, df, campo_fecha='Fecha'):
         """
         Genera resumen de actividad por año
         
         Args:
-            df (pd.DataFrame): DataFrame con votaciones
+            df (pd.DataFrame): DataFrame con votaciones (o iterador de bloques)
             campo_fecha (str): Campo con fecha
             
         Returns:
             pd.DataFrame: Resumen por año
         """
+        if not isinstance(df, pd.DataFrame):
+            parcial, = self._acumular(df, ResumenAnualParcial(campo_fecha))
+            return parcial.resultado()
+        
         if campo_fecha not in df.columns:
             print(f"✗ Campo '{campo_fecha}' no encontrado")
             return pd.DataFrame()
@@ -174,12 +303,39 @@ class DataProcessor:
             # Agrupar por año
             resumen = df.groupby('anno').size().reset_index(name='total_votaciones')
             
+            # Aprobados/rechazados por año según código de resultado
+            desenlaces = self._desenlaces(df)
+            if desenlaces is not None:
+                conteo = pd.DataFrame({
+                    'anno': df['anno'].to_numpy(),
+                    'aprobados': desenlaces == Desenlace.APROBADO,
+                    'rechazados': desenlaces == Desenlace.RECHAZADO
+                }).groupby('anno').sum().reset_index()
+                resumen = resumen.merge(conteo, on='anno', how='left')
+            
             return resumen
             
         except Exception as e:
             print(f"✗ Error generando resumen anual: {e}")
             return pd.DataFrame()
     
+    @memorizado
+    def generar_series_temporales(self, df):
+        """
+        Genera series de tiempo: conteos diarios y semanales, aprobación móvil,
+        distribuciones de margen y abstención, y densidad de días de sesión
+        
+        Args:
+            df (pd.DataFrame): DataFrame con votaciones (o iterador de bloques)
+            
+        Returns:
+            SeriesTemporales: Series con agregado incremental (ver series.py)
+        """
+        series = SeriesTemporales()
+        n = series.agregar(df)
+        print(f"✓ Series de tiempo: {n:,} votaciones en {len(series.diario):,} días de sesión")
+        return series
+    
     def guardar_csv(self, df, filename):
         """
         Guarda DataFrame como CSV
@@ -198,11 +354,99 @@ class DataProcessor:
             return False
 
 
+def verificar_modo_chunks(processor, tamano_chunk=3000):
+    """
+    Compara el modo por bloques con el modo en memoria sobre data/raw
+    
+    Args:
+        processor (DataProcessor): Procesador a verificar
+        tamano_chunk (int): Filas por bloque
+        
+    Returns:
+        bool: True si los resultados coinciden
+    """
+    import glob
+    import tracemalloc
+    
+    archivos = sorted(os.path.basename(f) for f in glob.glob(f"{processor.input_dir}/votaciones_*.json"))
+    if not archivos:
+        print(f"✗ No se encontraron archivos en {processor.input_dir}/")
+        return False
+    
+    def en_memoria():
+        marcos = []
+        for archivo in archivos:
+            with open(f"{processor.input_dir}/{archivo}", 'r', encoding='utf-8') as f:
+                marcos.append(pd.DataFrame(json.load(f)))
+        df = pd.concat(marcos, ignore_index=True)
+        return (processor.generar_estadisticas_generales(df.copy()),
+                processor.generar_resumen_anual(df.copy()))
+    
+    def por_chunks():
+        resultado = processor.procesar_por_chunks(archivos, tamano_chunk)
+        return resultado['estadisticas'], resultado['resumen_anual']
+    
+    # Sin caché, para comparar cálculos y no resultados guardados
+    cache, processor.cache = processor.cache, None
+    medidas = {}
+    try:
+        for nombre, funcion in (('memoria', en_memoria), ('chunks', por_chunks)):
+            tracemalloc.start()
+            medidas[nombre] = funcion()
+            pico = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"  {nombre:<8} pico de memoria: {pico / 1024**2:6.1f} MB")
+    finally:
+        processor.cache = cache
+    
+    (stats_a, anual_a), (stats_b, anual_b) = medidas['memoria'], medidas['chunks']
+    errores = []
+    
+    # Los tipos difieren a propósito (bloques tipados); el resto debe coincidir
+    for clave in ('total_votaciones', 'columnas', 'periodo', 'desenlaces'):
+        if stats_a.get(clave) != stats_b.get(clave):
+            errores.append(clave)
+    for col, info in stats_a['resumen_campos'].items():
+        otro = stats_b['resumen_campos'].get(col, {})
+        if (info['valores_unicos'], info['valores_nulos']) != (otro.get('valores_unicos'), otro.get('valores_nulos')):
+            errores.append(f"resumen_campos.{col}")
+    if not anual_a.equals(anual_b):
+        errores.append('resumen_anual')
+    
+    # Detalle por diputado sintético (los datos incluidos no lo traen)
+    votos = ['Afirmativo', 'En Contra', 'Abstención', 'Pareo']
+    detalle = pd.DataFrame({
+        'Diputado': [f"Diputado {i % 155}" for i in range(20000)],
+        'Voto': [votos[(i * 7) % 11 % 4] for i in range(20000)]
+    })
+    parl_a = processor.analizar_parlamentario(detalle.copy())
+    parl_b = processor.analizar_parlamentario(
+        detalle.iloc[i:i + tamano_chunk] for i in range(0, len(detalle), tamano_chunk)
+    )
+    if not parl_a.equals(parl_b):
+        errores.append('analizar_parlamentario')
+    
+    if errores:
+        print(f"✗ El modo por bloques difiere en: {', '.join(errores)}")
+        return False
+    print(f"✓ Modo por bloques ({tamano_chunk} filas) igual al modo en memoria "
+          f"({stats_a['total_votaciones']:,} votaciones, {len(anual_a)} años)")
+    return True
+
+
 def main():
-    """Función principal para testing"""
+    """
+    Función principal para testing
+    
+    Returns:
+        int: 0 si el modo por bloques coincide con el modo en memoria, 1 si no
+    """
     
     processor = DataProcessor()
     
+    print("Verificando modo por bloques...")
+    modo_chunks_ok = verificar_modo_chunks(processor)
+    
     # Cargar datos
     df = processor.cargar_votaciones('votaciones_2024.json')
     
@@ -225,7 +469,9 @@ def main():
         
         # Preparar datos para visualización
         processor.preparar_para_visualizacion(df)
+    
+    return 0 if modo_chunks_ok else 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
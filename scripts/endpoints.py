@@ -0,0 +1,218 @@
+"""
+Registro declarativo de endpoints del API OpenData de la Cámara
+
+Cada endpoint se describe con un diccionario:
+
+    servicio   Servicio .asmx que expone la operación
+    operacion  Nombre de la operación (método web)
+    params     Nombre lógico -> nombre del parámetro en el API
+    registro   Elemento XML que representa un registro
+    atributos  Atributos a conservar ('*' para todos); cada uno se guarda
+               como <Campo>_<Atributo>
+    tipos      Campo -> tipo ('texto', 'entero', 'decimal', 'booleano');
+               los campos no listados se dejan como texto
+    salida     Plantilla del JSON particionado, formateada con los params
+
+Agregar un endpoint es agregar una entrada a ENDPOINTS; el parser,
+el archivo comprimido y la descarga concurrente son los mismos para todos.
+"""
+
+from contextlib import nullcontext
+import json
+import os
+import xml.etree.ElementTree as ET
+
+from .archivo import abrir_xml
+
+
+NAMESPACE = 'http://opendata.camara.cl/camaradiputados/v1'
+
+ENDPOINTS = {
+    'votaciones': {
+        'servicio': 'WSLegislativo',
+        'operacion': 'retornarVotacionesXAnno',
+        'params': {'anno': 'prmAnno'},
+        'registro': 'Votacion',
+        # Se conservan como texto para mantener el formato de votaciones_YYYY.json
+        'atributos': ['Valor'],
+        'tipos': {},
+        'salida': 'votaciones_{anno}.json',
+    },
+    'mociones': {
+        'servicio': 'WSLegislativo',
+        'operacion': 'retornarMocionesXAnno',
+        'params': {'anno': 'prmAnno'},
+        'registro': 'ProyectoLey',
+        'atributos': '*',
+        'tipos': {'Id': 'entero'},
+        'salida': 'mociones_{anno}.json',
+    },
+    'mensajes': {
+        'servicio': 'WSLegislativo',
+        'operacion': 'retornarMensajesXAnno',
+        'params': {'anno': 'prmAnno'},
+        'registro': 'ProyectoLey',
+        'atributos': '*',
+        'tipos': {'Id': 'entero'},
+        'salida': 'mensajes_{anno}.json',
+    },
+    'sesiones': {
+        'servicio': 'WSSala',
+        'operacion': 'retornarSesionesXLegislatura',
+        'params': {'legislatura': 'prmLegislaturaId'},
+        'registro': 'Sesion',
+        'atributos': '*',
+        'tipos': {'Id': 'entero', 'Numero': 'entero'},
+        'salida': 'sesiones_{legislatura}.json',
+    },
+    'diputados': {
+        'servicio': 'WSDiputado',
+        'operacion': 'retornarDiputadosPeriodoActual',
+        'params': {},
+        'registro': 'Diputado',
+        'atributos': '*',
+        'tipos': {'Id': 'entero'},
+        'salida': 'diputados.json',
+    },
+}
+
+_CONVERSORES = {
+    'texto': str,
+    'entero': int,
+    'decimal': float,
+    'booleano': lambda v: v.strip().lower() in ('true', '1', 'si', 'sí'),
+}
+
+
+def obtener_esquema(endpoint):
+    """
+    Obtiene la descripción de un endpoint registrado
+
+    Args:
+        endpoint (str): Nombre lógico del endpoint (ej: 'votaciones')
+
+    Returns:
+        dict: Esquema del endpoint
+    """
+    try:
+        return ENDPOINTS[endpoint]
+    except KeyError:
+        raise ValueError(
+            f"Endpoint desconocido: {endpoint}. Disponibles: {', '.join(ENDPOINTS)}"
+        ) from None
+
+
+def _nombre_local(tag):
+    """Remueve el namespace de un tag o atributo"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _convertir(valor, tipo):
+    """Convierte un texto al tipo declarado, o None si no es convertible"""
+    if valor is None or tipo in (None, 'texto'):
+        return valor
+    try:
+        return _CONVERSORES[tipo](valor)
+    except (TypeError, ValueError):
+        return None
+
+
+def elemento_a_dict(elemento, esquema):
+    """
+    Convierte un elemento de registro en diccionario según su esquema
+
+    Los elementos hoja se convierten en campos; los elementos con hijos
+    se convierten en un diccionario (si sus hijos son hojas) o en una
+    lista de diccionarios (si contienen sub-registros).
+
+    Args:
+        elemento (Element): Elemento XML del registro
+        esquema (dict): Esquema del endpoint
+
+    Returns:
+        dict: Campos del registro
+    """
+    atributos = esquema.get('atributos', '*')
+    tipos = esquema.get('tipos', {})
+    registro = {}
+
+    for child in elemento:
+        tag = _nombre_local(child.tag)
+
+        if len(child):
+            if all(len(nieto) == 0 for nieto in child):
+                registro[tag] = elemento_a_dict(child, esquema)
+            else:
+                registro[tag] = [elemento_a_dict(nieto, esquema) for nieto in child]
+            continue
+
+        # Atributos propios del registro (se ignoran xsi:nil y similares)
+        for nombre, valor in child.attrib.items():
+            if '}' in nombre:
+                continue
+            if atributos == '*' or nombre in atributos:
+                registro[f"{tag}_{nombre}"] = valor
+
+        # El texto del elemento, o el atributo 'Valor' si no hay texto
+        texto = child.text if child.text else child.attrib.get('Valor')
+        registro[tag] = _convertir(texto, tipos.get(tag))
+
+    return registro
+
+
+def iterar_registros_xml(fuente, esquema):
+    """
+    Recorre los registros de un XML en streaming, sin cargarlo completo
+
+    Solo se entregan los registros de primer nivel; un elemento con el
+    mismo nombre anidado dentro de un registro forma parte de ese registro.
+
+    Args:
+        fuente (str|file): Ruta a un .xml/.xml.gz o archivo binario abierto
+        esquema (dict): Esquema del endpoint
+
+    Yields:
+        dict: Un registro por elemento
+    """
+    registro = esquema['registro']
+    contexto = abrir_xml(fuente) if isinstance(fuente, str) else nullcontext(fuente)
+    nivel = 0
+
+    with contexto as f:
+        for evento, elem in ET.iterparse(f, events=('start', 'end')):
+            if _nombre_local(elem.tag) != registro:
+                continue
+            if evento == 'start':
+                nivel += 1
+                continue
+            nivel -= 1
+            if nivel == 0:
+                yield elemento_a_dict(elem, esquema)
+                # Liberar memoria del elemento ya procesado
+                elem.clear()
+
+
+def reconstruir_json(fuente, endpoint, params, output_dir):
+    """
+    Parsea un XML archivado y escribe el JSON de salida del endpoint
+
+    Solo usa la biblioteca estándar: 'rebuild' la ejecuta en procesos
+    aparte, que así no cargan pandas, numpy ni requests.
+
+    Args:
+        fuente (str): Archivo .xml o .xml.gz
+        endpoint (str): Nombre lógico del endpoint
+        params (dict): Parámetros de la consulta (ej: {'anno': '2024'})
+        output_dir (str): Directorio del JSON (nombre según la plantilla 'salida')
+
+    Returns:
+        list: Registros parseados
+    """
+    esquema = obtener_esquema(endpoint)
+    registros = list(iterar_registros_xml(fuente, esquema))
+
+    ruta = os.path.join(output_dir, esquema['salida'].format(**params))
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(registros, f, ensure_ascii=False, indent=2)
+
+    return registros
@@ -0,0 +1,421 @@
+"""
+Procesamiento por bloques (chunks) con memoria acotada
+
+Los archivos se leen registro a registro y se agrupan en DataFrames de
+tamaño fijo con tipos compactos. Cada análisis de DataProcessor tiene
+aquí un acumulador parcial: se alimenta bloque a bloque, se combina con
+otros parciales (por ejemplo, de otro proceso) y entrega al final el
+mismo resultado que el análisis en memoria.
+"""
+
+import json
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from .clasificacion import CAMPOS_CODIFICADOS, Desenlace, desenlace_de_serie
+
+
+TAMANO_CHUNK = 10000
+
+# Techo de memoria por defecto: bloque en proceso + acumuladores
+MEMORIA_MAXIMA = 256 * 1024 ** 2
+
+# Tipos compactos de las columnas conocidas
+CAMPOS_ENTEROS = ['TotalSi', 'TotalNo', 'TotalAbstencion', 'TotalDispensado']
+CAMPOS_CATEGORICOS = ['Quorum', 'Resultado', 'Tipo', 'Voto', 'TipoVoto']
+
+# Mínimo de valores por contador aproximado de distintos
+MIN_VALORES_SKETCH = 1024
+
+# Estimación de memoria por entrada de un Counter (clave, valor y tabla hash)
+BYTES_POR_ENTRADA = 100
+
+
+def iterar_registros_json(ruta, tamano_bloque=1 << 16):
+    """
+    Recorre los elementos de un arreglo JSON sin cargar el archivo completo
+
+    Args:
+        ruta (str): Archivo con un arreglo JSON de objetos
+        tamano_bloque (int): Caracteres leídos por vez
+
+    Yields:
+        dict: Un registro por elemento del arreglo
+    """
+    decoder = json.JSONDecoder()
+    with open(ruta, 'r', encoding='utf-8') as f:
+        buffer = f.read(tamano_bloque).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f"{ruta} no contiene un arreglo JSON")
+        pos = 1
+        fin_archivo = False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+
+            if pos >= len(buffer):
+                if fin_archivo:
+                    raise ValueError(f"{ruta}: arreglo JSON incompleto")
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                buffer, pos = buffer[pos:] + bloque, 0
+                continue
+
+            if buffer[pos] == ']':
+                return
+
+            try:
+                registro, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # El registro quedó cortado entre bloques
+                bloque = f.read(tamano_bloque)
+                if not bloque:
+                    raise
+                buffer, pos = buffer[pos:] + bloque, 0
+                continue
+
+            yield registro
+
+            if pos > tamano_bloque:
+                buffer, pos = buffer[pos:], 0
+
+
+def _a_entero(serie, tipo):
+    """
+    Convierte una columna de texto a un entero con nulos (Int32, Int16)
+
+    Como en clasificacion.a_numerico, la conversión directa es mucho más
+    rápida; pd.to_numeric solo se usa si hay vacíos o valores no numéricos.
+    """
+    try:
+        return serie.astype(tipo.lower()).astype(tipo)
+    except (ValueError, TypeError):
+        return pd.to_numeric(serie, errors='coerce').astype(tipo)
+
+
+def tipar_chunk(df):
+    """
+    Convierte las columnas conocidas a tipos compactos
+
+    Totales a Int32, códigos (*_Valor) a Int16, fechas a datetime64 y
+    etiquetas a category. Las demás columnas quedan como están.
+
+    Args:
+        df (pd.DataFrame): Bloque recién construido desde los registros
+
+    Returns:
+        pd.DataFrame: El mismo bloque, tipado
+    """
+    for campo in CAMPOS_ENTEROS:
+        if campo in df.columns:
+            df[campo] = _a_entero(df[campo], 'Int32')
+    for campo in CAMPOS_CODIFICADOS:
+        if campo in df.columns:
+            df[campo] = _a_entero(df[campo], 'Int16')
+    for campo in CAMPOS_CATEGORICOS:
+        if campo in df.columns:
+            df[campo] = df[campo].astype('category')
+    if 'Fecha' in df.columns:
+        df['Fecha'] = pd.to_datetime(df['Fecha'], errors='coerce')
+    return df
+
+
+def iterar_chunks(rutas, tamano_chunk=TAMANO_CHUNK):
+    """
+    Agrupa los registros de uno o más archivos en bloques tipados
+
+    Args:
+        rutas (list): Archivos JSON (arreglos de registros)
+        tamano_chunk (int): Filas por bloque (el último puede ser menor)
+
+    Yields:
+        pd.DataFrame: Bloques de tamaño fijo
+    """
+    registros = []
+    for ruta in rutas:
+        for registro in iterar_registros_json(ruta):
+            registros.append(registro)
+            if len(registros) == tamano_chunk:
+                yield tipar_chunk(pd.DataFrame(registros))
+                registros = []
+    if registros:
+        yield tipar_chunk(pd.DataFrame(registros))
+
+
+class LectorChunks:
+    """
+    Bloques tipados de uno o más archivos
+
+    Se puede recorrer varias veces (cada recorrido vuelve a leer los
+    archivos) y conserva las rutas de origen, que usa la caché de
+    resultados para calcular su clave sin leer los datos.
+    """
+
+    def __init__(self, rutas, tamano_chunk=TAMANO_CHUNK):
+        self.rutas = list(rutas)
+        self.tamano_chunk = tamano_chunk
+
+    def __iter__(self):
+        return iterar_chunks(self.rutas, self.tamano_chunk)
+
+
+def _desenlaces_chunk(chunk):
+    """Desenlace de cada votación del bloque, o None si no hay código de resultado"""
+    if 'Resultado_Valor' not in chunk.columns:
+        return None
+    return desenlace_de_serie(chunk['Resultado_Valor'])
+
+
+class ConteoDistinto:
+    """
+    Cuenta valores distintos por sus hashes de 64 bits
+
+    Es exacto mientras se guardan todos los hashes. Con reducir(k) pasa a
+    conservar solo los k menores (sketch KMV), que sigue siendo combinable
+    y estima el total con error relativo ~1/sqrt(k).
+    """
+
+    def __init__(self):
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.k = None
+
+    def agregar(self, serie):
+        valores = serie.dropna()
+        if len(valores):
+            nuevos = pd.util.hash_pandas_object(valores, index=False).to_numpy()
+            self._unir(nuevos)
+
+    def _unir(self, hashes):
+        self.hashes = np.unique(np.concatenate([self.hashes, hashes]))
+        if self.k is not None:
+            self.hashes = self.hashes[:self.k]
+
+    def combinar(self, otro):
+        if otro.k is not None:
+            self.k = otro.k if self.k is None else min(self.k, otro.k)
+        self._unir(otro.hashes)
+
+    def reducir(self, k):
+        self.k = k if self.k is None else min(self.k, k)
+        self.hashes = self.hashes[:self.k]
+
+    @property
+    def aproximado(self):
+        return self.k is not None and len(self.hashes) >= self.k
+
+    def total(self):
+        if not self.aproximado:
+            return len(self.hashes)
+        # k-ésimo menor hash, normalizado a (0, 1]
+        return int(round((self.k - 1) / ((float(self.hashes[-1]) + 1) / 2.0 ** 64)))
+
+    def tamano_bytes(self):
+        return self.hashes.nbytes
+
+
+class EstadisticasParciales:
+    """Acumulador de DataProcessor.generar_estadisticas_generales"""
+
+    def __init__(self):
+        self.total = 0
+        self.columnas = []
+        self.tipos = {}
+        self.nulos = Counter()
+        self.distintos = {}
+        self.campo_fecha = None
+        self.fecha_min = None
+        self.fecha_max = None
+        self.desenlaces = None
+
+    def agregar(self, chunk):
+        self.total += len(chunk)
+
+        for col in chunk.columns:
+            if col not in self.distintos:
+                self.columnas.append(col)
+                self.distintos[col] = ConteoDistinto()
+                self.tipos[col] = str(chunk[col].dtype)
+            elif self.tipos[col] != str(chunk[col].dtype):
+                self.tipos[col] = 'object'
+            self.nulos[col] += int(chunk[col].isna().sum())
+            self.distintos[col].agregar(chunk[col])
+
+        if self.campo_fecha is None:
+            campos_fecha = [c for c in chunk.columns if 'fecha' in c.lower() or 'date' in c.lower()]
+            self.campo_fecha = campos_fecha[0] if campos_fecha else False
+        if self.campo_fecha:
+            fechas = pd.to_datetime(chunk[self.campo_fecha], errors='coerce')
+            self._actualizar_periodo(fechas.min(), fechas.max())
+
+        desenlaces = _desenlaces_chunk(chunk)
+        if desenlaces is not None:
+            conteo = np.bincount(desenlaces, minlength=len(Desenlace))
+            self.desenlaces = conteo if self.desenlaces is None else self.desenlaces + conteo
+
+    def _actualizar_periodo(self, minimo, maximo):
+        if not pd.isna(minimo):
+            self.fecha_min = minimo if self.fecha_min is None else min(self.fecha_min, minimo)
+        if not pd.isna(maximo):
+            self.fecha_max = maximo if self.fecha_max is None else max(self.fecha_max, maximo)
+
+    def combinar(self, otro):
+        self.total += otro.total
+        for col in otro.columnas:
+            if col not in self.distintos:
+                self.columnas.append(col)
+                self.distintos[col] = ConteoDistinto()
+                self.tipos[col] = otro.tipos[col]
+            elif self.tipos[col] != otro.tipos[col]:
+                self.tipos[col] = 'object'
+            self.distintos[col].combinar(otro.distintos[col])
+        self.nulos.update(otro.nulos)
+        if self.campo_fecha is None:
+            self.campo_fecha = otro.campo_fecha
+        self._actualizar_periodo(otro.fecha_min, otro.fecha_max)
+        if otro.desenlaces is not None:
+            self.desenlaces = (otro.desenlaces if self.desenlaces is None
+                               else self.desenlaces + otro.desenlaces)
+        return self
+
+    def tamano_bytes(self):
+        return sum(c.tamano_bytes() for c in self.distintos.values())
+
+    def ajustar_memoria(self, presupuesto):
+        """Si los hashes superan el presupuesto, pasa los conteos a sketches de tamaño fijo"""
+        if self.distintos and self.tamano_bytes() > presupuesto:
+            k = max(MIN_VALORES_SKETCH, int(presupuesto) // (8 * len(self.distintos)))
+            for conteo in self.distintos.values():
+                conteo.reducir(k)
+
+    def resultado(self):
+        stats = {
+            'total_votaciones': self.total,
+            'columnas': list(self.columnas),
+            'periodo': {
+                'inicio': self.fecha_min.strftime('%Y-%m-%d') if self.fecha_min is not None else None,
+                'fin': self.fecha_max.strftime('%Y-%m-%d') if self.fecha_max is not None else None
+            },
+            'resumen_campos': {}
+        }
+
+        if self.desenlaces is not None:
+            stats['desenlaces'] = {
+                'aprobados': int(self.desenlaces[Desenlace.APROBADO]),
+                'rechazados': int(self.desenlaces[Desenlace.RECHAZADO]),
+                'otros': int(self.desenlaces[Desenlace.OTRO])
+            }
+
+        for col in self.columnas:
+            stats['resumen_campos'][col] = {
+                'valores_unicos': self.distintos[col].total(),
+                'valores_nulos': self.nulos[col],
+                'tipo': self.tipos[col]
+            }
+
+        if any(c.aproximado for c in self.distintos.values()):
+            stats['valores_unicos_aproximados'] = True
+
+        return stats
+
+
+class ResumenAnualParcial:
+    """Acumulador de DataProcessor.generar_resumen_anual"""
+
+    def __init__(self, campo_fecha='Fecha'):
+        self.campo_fecha = campo_fecha
+        self.totales = Counter()
+        self.aprobados = Counter()
+        self.rechazados = Counter()
+        self.con_desenlace = False
+
+    def agregar(self, chunk):
+        if self.campo_fecha not in chunk.columns:
+            return
+        fechas = pd.to_datetime(chunk[self.campo_fecha], errors='coerce')
+        validas = fechas.notna().to_numpy()
+        annos = fechas.dt.year.to_numpy()[validas].astype(np.int32)
+        self.totales.update(dict(zip(*np.unique(annos, return_counts=True))))
+
+        desenlaces = _desenlaces_chunk(chunk)
+        if desenlaces is not None:
+            self.con_desenlace = True
+            desenlaces = desenlaces[validas]
+            self.aprobados.update(Counter(annos[desenlaces == Desenlace.APROBADO].tolist()))
+            self.rechazados.update(Counter(annos[desenlaces == Desenlace.RECHAZADO].tolist()))
+
+    def combinar(self, otro):
+        self.totales.update(otro.totales)
+        self.aprobados.update(otro.aprobados)
+        self.rechazados.update(otro.rechazados)
+        self.con_desenlace = self.con_desenlace or otro.con_desenlace
+        return self
+
+    def tamano_bytes(self):
+        return BYTES_POR_ENTRADA * 3 * len(self.totales)
+
+    def ajustar_memoria(self, presupuesto):
+        pass
+
+    def resultado(self):
+        annos = sorted(int(a) for a in self.totales)
+        resumen = pd.DataFrame({
+            'anno': np.array(annos, dtype=np.int32),
+            'total_votaciones': np.array([self.totales[a] for a in annos], dtype=np.int64)
+        })
+        if self.con_desenlace:
+            resumen['aprobados'] = np.array([self.aprobados[a] for a in annos], dtype=np.int64)
+            resumen['rechazados'] = np.array([self.rechazados[a] for a in annos], dtype=np.int64)
+        return resumen
+
+
+class ActividadParlamentariaParcial:
+    """Acumulador de DataProcessor.analizar_parlamentario"""
+
+    def __init__(self, campo_parlamentario='Diputado'):
+        self.campo_parlamentario = campo_parlamentario
+        self.campo_voto = None
+        self.totales = Counter()
+        self.votos = Counter()
+
+    def agregar(self, chunk):
+        campo = self.campo_parlamentario
+        if campo not in chunk.columns:
+            return
+        self.totales.update(chunk[campo].dropna().tolist())
+
+        if self.campo_voto is None:
+            self.campo_voto = ('Voto' if 'Voto' in chunk.columns
+                               else 'TipoVoto' if 'TipoVoto' in chunk.columns
+                               else False)
+        if self.campo_voto:
+            pares = chunk[[campo, self.campo_voto]].dropna()
+            self.votos.update(zip(pares[campo].tolist(), pares[self.campo_voto].tolist()))
+
+    def combinar(self, otro):
+        self.totales.update(otro.totales)
+        self.votos.update(otro.votos)
+        if self.campo_voto is None:
+            self.campo_voto = otro.campo_voto
+        return self
+
+    def tamano_bytes(self):
+        return BYTES_POR_ENTRADA * (len(self.totales) + len(self.votos))
+
+    def ajustar_memoria(self, presupuesto):
+        pass
+
+    def resultado(self):
+        campo = self.campo_parlamentario
+        parlamentarios = sorted(self.totales)
+        stats = pd.DataFrame(
+            {'total_votaciones': [self.totales[p] for p in parlamentarios]},
+            index=pd.Index(parlamentarios, name=campo)
+        )
+        if self.campo_voto:
+            tipos = sorted({voto for _, voto in self.votos})
+            for voto in tipos:
+                stats[voto] = np.array([self.votos[(p, voto)] for p in parlamentarios], dtype=np.int64)
+        return stats.reset_index()
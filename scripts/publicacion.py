@@ -0,0 +1,231 @@
+"""
+Publicación versionada de los datos del sitio
+
+Cada archivo se publica con el hash de su contenido en el nombre
+(docs/data/v/votaciones.<hash>.json), por lo que nunca cambia y puede
+guardarse en caché indefinidamente. docs/data/manifest.json, el único
+archivo que cambia, indica qué versión usar y lista los registros de
+cambios (docs/data/cambios/). Cada registro lleva de la ventana de
+votaciones publicada antes (las últimas limite_votaciones) a la actual:
+las que entraron, las que cambiaron y las que salieron. La ventana
+anterior se lee de su copia en v/ (la que indica el manifiesto previo),
+así que el registro corresponde siempre a la versión 'desde' publicada.
+Un cliente que ya tiene una versión solo descarga esos registros; si un
+registro pesa más que el archivo completo, no se escribe y el cliente
+descarga el archivo completo.
+"""
+
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime
+
+
+MANIFIESTO = 'manifest.json'
+
+# Registros de cambios que se mantienen listados en el manifiesto
+MAX_CAMBIOS = 20
+
+# Claves que cambian en cada ejecución aunque los datos no cambien;
+# se omiten de los archivos versionados (la fecha queda en el manifiesto)
+CLAVES_VOLATILES = ('fecha_actualizacion',)
+
+
+def _json_compacto(datos):
+    """Serializa a JSON compacto y determinista"""
+    return json.dumps(datos, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def _sin_claves_volatiles(datos):
+    """Copia de los datos sin marcas de tiempo (nivel superior y 'metadata')"""
+    if not isinstance(datos, dict):
+        return datos
+    limpio = {k: v for k, v in datos.items() if k not in CLAVES_VOLATILES}
+    if isinstance(limpio.get('metadata'), dict):
+        limpio['metadata'] = {
+            k: v for k, v in limpio['metadata'].items() if k not in CLAVES_VOLATILES
+        }
+    return limpio
+
+
+def escribir_versionado(datos, nombre, directorio):
+    """
+    Escribe datos con el hash de su contenido en el nombre del archivo
+
+    Args:
+        datos: Datos serializables a JSON
+        nombre (str): Nombre lógico (ej: 'votaciones' o 'boletines/17')
+        directorio (str): Directorio base de los datos del sitio
+
+    Returns:
+        str: Ruta relativa al directorio base (ej: 'v/votaciones.3f2a9c1b04de.json';
+            'boletines/17' se guarda como 'v/boletines.17.<hash>.json')
+    """
+    contenido = _json_compacto(_sin_claves_volatiles(datos))
+    huella = hashlib.sha256(contenido).hexdigest()[:12]
+    relativa = f"v/{nombre.replace('/', '.')}.{huella}.json"
+    ruta = os.path.join(directorio, relativa)
+
+    # El contenido es inmutable: si ya existe no hay nada que escribir
+    if not os.path.exists(ruta):
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, 'wb') as f:
+            f.write(contenido)
+
+    return relativa
+
+
+def huellas_votaciones(votaciones):
+    """
+    Huella corta del contenido de cada votación
+
+    Args:
+        votaciones (list): Votaciones en formato del API
+
+    Returns:
+        dict: Id -> huella hexadecimal
+    """
+    return {
+        str(v.get('Id')): hashlib.blake2b(_json_compacto(v), digest_size=6).hexdigest()
+        for v in votaciones
+    }
+
+
+def calcular_cambios(huellas_previas, huellas, votaciones):
+    """
+    Compara dos ventanas publicadas y devuelve lo necesario para pasar de una a otra
+
+    Args:
+        huellas_previas (dict): Huellas de la ventana publicada antes
+        huellas (dict): Huellas de la ventana actual
+        votaciones (list): Votaciones de la ventana actual
+
+    Returns:
+        dict: Listas 'agregadas' (entraron a la ventana, aunque no hayan cambiado) y
+            'modificadas' (registros completos) y 'eliminadas' (Ids que salieron)
+    """
+    agregadas, modificadas = [], []
+    for v in votaciones:
+        id_votacion = str(v.get('Id'))
+        previa = huellas_previas.get(id_votacion)
+        if previa is None:
+            agregadas.append(v)
+        elif previa != huellas[id_votacion]:
+            modificadas.append(v)
+
+    eliminadas = sorted(set(huellas_previas) - set(huellas))
+    return {'agregadas': agregadas, 'modificadas': modificadas, 'eliminadas': eliminadas}
+
+
+def _leer_json(ruta, por_defecto=None):
+    """Lee un JSON o devuelve el valor por defecto si no existe"""
+    if not os.path.exists(ruta):
+        return por_defecto
+    with open(ruta, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _leer_ventana_previa(directorio, manifiesto_previo, limite_votaciones):
+    """Votaciones de la versión publicada antes (desde v/), o None si no son comparables"""
+    relativa = manifiesto_previo.get('archivos', {}).get('votaciones')
+    if not relativa or manifiesto_previo.get('limite_votaciones') != limite_votaciones:
+        return None
+    previo = _leer_json(os.path.join(directorio, relativa))
+    if not isinstance(previo, dict):
+        return None
+    return previo.get('votaciones')
+
+
+def publicar_versionado(archivos, directorio='docs/data', limite_votaciones=1000):
+    """
+    Publica los archivos del sitio versionados, con manifiesto y registro de cambios
+
+    Args:
+        archivos (dict): Nombre lógico -> datos (ej: {'votaciones': {...}}); los
+            cambios se calculan sobre archivos['votaciones']['votaciones']
+        directorio (str): Directorio de datos del sitio
+        limite_votaciones (int): Votaciones incluidas en el archivo 'votaciones'
+
+    Returns:
+        dict: Manifiesto publicado
+    """
+    ruta_manifiesto = os.path.join(directorio, MANIFIESTO)
+    manifiesto_previo = _leer_json(ruta_manifiesto, {})
+
+    rutas = {
+        nombre: escribir_versionado(datos, nombre, directorio)
+        for nombre, datos in archivos.items()
+    }
+    version = hashlib.sha256(
+        ''.join(f"{n}={rutas[n]}" for n in sorted(rutas)).encode('utf-8')
+    ).hexdigest()[:12]
+
+    cambios = list(manifiesto_previo.get('cambios', []))
+    version_previa = manifiesto_previo.get('version')
+
+    # Registro de cambios entre la ventana de la versión previa y la actual
+    datos_votaciones = archivos.get('votaciones', {})
+    ventana_previa = _leer_ventana_previa(directorio, manifiesto_previo, limite_votaciones)
+    if (ventana_previa is not None and 'votaciones' in rutas
+            and version_previa and version_previa != version):
+        ventana = datos_votaciones.get('votaciones', [])
+        delta = calcular_cambios(huellas_votaciones(ventana_previa), huellas_votaciones(ventana), ventana)
+        registro = {
+            'desde': version_previa,
+            'hasta': version,
+            'metadata': _sin_claves_volatiles(datos_votaciones).get('metadata'),
+            **delta
+        }
+        contenido = _json_compacto(registro)
+
+        # Un registro más pesado que el archivo completo no ahorra nada: sin él la
+        # cadena se corta y los clientes descargan el archivo completo
+        if len(contenido) < os.path.getsize(os.path.join(directorio, rutas['votaciones'])):
+            relativa = f"cambios/{version_previa}-{version}.json"
+            os.makedirs(os.path.join(directorio, 'cambios'), exist_ok=True)
+            with open(os.path.join(directorio, relativa), 'wb') as f:
+                f.write(contenido)
+            # Las versiones son hashes: si los datos vuelven a un estado anterior,
+            # el mismo paso puede repetirse y reemplaza al registrado antes
+            cambios = [c for c in cambios if (c['desde'], c['hasta']) != (version_previa, version)]
+            cambios.append({
+                'desde': version_previa,
+                'hasta': version,
+                'archivo': relativa,
+                'agregadas': len(delta['agregadas']),
+                'modificadas': len(delta['modificadas']),
+                'eliminadas': len(delta['eliminadas'])
+            })
+            cambios = cambios[-MAX_CAMBIOS:]
+
+    manifiesto = {
+        'version': version,
+        'fecha_actualizacion': datetime.now().isoformat(),
+        'limite_votaciones': limite_votaciones,
+        'archivos': rutas,
+        'cambios': cambios
+    }
+    with open(ruta_manifiesto, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f, ensure_ascii=False, indent=2)
+
+    _podar(directorio, manifiesto, manifiesto_previo)
+    return manifiesto
+
+
+def _podar(directorio, manifiesto, manifiesto_previo):
+    """
+    Borra archivos versionados y registros de cambios que ya no se referencian
+
+    Se conservan los de la versión anterior para clientes que leyeron el
+    manifiesto previo justo antes de esta publicación.
+    """
+    vigentes = set(manifiesto['archivos'].values())
+    vigentes |= set(manifiesto_previo.get('archivos', {}).values())
+    vigentes |= {c['archivo'] for c in manifiesto['cambios']}
+
+    for patron in ('v/*.json', 'cambios/*.json'):
+        for ruta in glob.glob(os.path.join(directorio, patron)):
+            relativa = os.path.relpath(ruta, directorio).replace(os.sep, '/')
+            if relativa not in vigentes:
+                os.remove(ruta)
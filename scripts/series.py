@@ -0,0 +1,397 @@
+"""
+Series de tiempo de votaciones
+
+Toda la historia se resume en una tabla diaria (una fila por día con
+votaciones) y en histogramas por año de margen (TotalSi - TotalNo) y
+tasa de abstención. Ambos son aditivos, así que agregar votaciones nuevas
+solo suma filas; las series derivadas (semanal, mensual, aprobación
+móvil) se recalculan desde el primer día afectado en adelante.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .clasificacion import Desenlace, a_numerico, desenlace_de_serie
+
+
+# Histogramas: márgenes en tramos de 10 votos, abstención en tramos de 5%
+BORDES_MARGEN = np.arange(-160, 161, 10)
+BORDES_ABSTENCION = np.linspace(0, 1, 21)
+
+VENTANA_APROBACION = '90D'
+
+# Las semanas empiezan el lunes
+FRECUENCIA_SEMANAL = 'W-MON'
+
+COLUMNAS_DIARIAS = [
+    'votaciones', 'aprobadas', 'rechazadas',
+    'con_margen', 'suma_margen', 'con_abstencion', 'suma_abstencion'
+]
+
+
+def _a_float(serie):
+    """Columna numérica (texto, Int32 con nulos, etc.) a float, con NaN para vacíos"""
+    if serie.dtype == object or pd.api.types.is_string_dtype(serie):
+        return a_numerico(serie)
+    return pd.to_numeric(serie, errors='coerce').astype('Float64').to_numpy(dtype=float, na_value=np.nan)
+
+
+def _claves_id(serie):
+    """
+    Id de cada votación, para reconocer las ya agregadas
+
+    Los Ids enteros se normalizan a int ('7', 7 y 7.0 son el mismo); los
+    demás se comparan como texto. Los vacíos quedan como None.
+    """
+    numeros = _a_float(serie)
+    enteros = np.isfinite(numeros) & (numeros == np.round(numeros))
+    claves = np.where(enteros, numeros, 0).astype(np.int64).astype(object)
+    if not enteros.all():
+        otros = ~enteros
+        texto = serie[otros].astype('string').str.strip().replace('', pd.NA)
+        claves[otros] = texto.astype(object).where(texto.notna(), None).to_numpy()
+    return claves
+
+
+def _tramos(valores, bordes):
+    """Índice de tramo de cada valor (los extremos van al primer/último tramo)"""
+    return np.clip(np.searchsorted(bordes, valores, side='right') - 1, 0, len(bordes) - 2)
+
+
+def _histograma_por_anio(anios, valores, bordes):
+    """Conteos por año y tramo, como DataFrame (años x tramos)"""
+    validos = ~np.isnan(valores)
+    conteo = pd.DataFrame({
+        'anio': anios[validos],
+        'tramo': _tramos(valores[validos], bordes)
+    }).value_counts()
+    tabla = conteo.unstack(fill_value=0) if len(conteo) else pd.DataFrame()
+    return tabla.reindex(columns=range(len(bordes) - 1), fill_value=0).astype(np.int64)
+
+
+def _sumar_tablas(a, b):
+    """Suma dos tablas indexadas (por día o por año), conservando enteros"""
+    if a is None or a.empty:
+        return b
+    if b.empty:
+        return a
+    if b.index.min() > a.index.max():
+        return pd.concat([a, b])
+    return pd.concat([a, b]).groupby(level=0).sum().sort_index()
+
+
+def _redondear(valores, decimales):
+    """Lista JSON compacta: floats redondeados y None para NaN"""
+    return [None if np.isnan(v) else round(float(v), decimales) for v in valores]
+
+
+class SeriesTemporales:
+    """
+    Series de tiempo con agregado incremental
+
+    Uso:
+        series = SeriesTemporales()
+        series.agregar(df)            # DataFrame, bloques o lista de dicts
+        series.semanal()
+        series.agregar(df_nuevas)     # solo se recalcula la cola
+    """
+
+    def __init__(self):
+        self.diario = pd.DataFrame(columns=COLUMNAS_DIARIAS, dtype=np.int64)
+        self.diario.index = pd.DatetimeIndex([], name='dia')
+        self.hist_margen = None
+        self.hist_abstencion = None
+        self.ids = set()
+
+        # Series derivadas ya calculadas y el primer día que quedó desactualizado en cada una
+        self._derivadas = {}
+        self._pendiente = {}
+
+    def agregar(self, votaciones):
+        """
+        Agrega votaciones nuevas (las que tengan un Id ya visto se ignoran;
+        las que no tienen Id se agregan siempre)
+
+        Args:
+            votaciones: DataFrame, lista de dicts o iterador de bloques
+
+        Returns:
+            int: Votaciones agregadas
+        """
+        if isinstance(votaciones, list):
+            votaciones = pd.DataFrame(votaciones)
+        if not isinstance(votaciones, pd.DataFrame):
+            return sum(self.agregar(chunk) for chunk in votaciones)
+        if votaciones.empty or 'Fecha' not in votaciones.columns:
+            return 0
+
+        df = votaciones
+        if 'Id' in df.columns:
+            claves = _claves_id(df['Id'])
+            con_id = pd.notna(claves)
+            vistas = np.fromiter((c in self.ids for c in claves), dtype=bool, count=len(claves))
+            # Duplicados dentro del mismo lote
+            repetidas = pd.Series(claves).duplicated().to_numpy()
+            nuevas = ~con_id | ~(vistas | repetidas)
+            df = df.loc[nuevas]
+            self.ids.update(claves[nuevas & con_id])
+
+        fechas = pd.to_datetime(df['Fecha'], errors='coerce')
+        validas = fechas.notna().to_numpy()
+        if not validas.any():
+            return 0
+        df = df.loc[validas]
+        fechas = fechas[validas]
+
+        si, no, abstencion = (
+            _a_float(df[c]) if c in df.columns else np.full(len(df), np.nan)
+            for c in ('TotalSi', 'TotalNo', 'TotalAbstencion')
+        )
+        margen = si - no
+        emitidos = si + no + abstencion
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tasa_abstencion = np.where(emitidos > 0, abstencion / emitidos, np.nan)
+
+        if 'Resultado_Valor' in df.columns:
+            desenlaces = desenlace_de_serie(df['Resultado_Valor'])
+        else:
+            desenlaces = np.full(len(df), Desenlace.DESCONOCIDO)
+
+        dias = fechas.dt.normalize().to_numpy()
+        diario = pd.DataFrame({
+            'votaciones': np.ones(len(df), dtype=np.int64),
+            'aprobadas': desenlaces == Desenlace.APROBADO,
+            'rechazadas': desenlaces == Desenlace.RECHAZADO,
+            'con_margen': ~np.isnan(margen),
+            'suma_margen': np.nan_to_num(margen),
+            'con_abstencion': ~np.isnan(tasa_abstencion),
+            'suma_abstencion': np.nan_to_num(tasa_abstencion)
+        }).groupby(pd.DatetimeIndex(dias, name='dia')).sum()
+        self.diario = _sumar_tablas(self.diario, diario)
+
+        anios = fechas.dt.year.to_numpy()
+        self.hist_margen = _sumar_tablas(
+            self.hist_margen, _histograma_por_anio(anios, margen, BORDES_MARGEN))
+        self.hist_abstencion = _sumar_tablas(
+            self.hist_abstencion, _histograma_por_anio(anios, tasa_abstencion, BORDES_ABSTENCION))
+
+        # Las series derivadas quedan desactualizadas desde el primer día nuevo
+        primer_dia = diario.index.min()
+        for clave in self._derivadas:
+            previo = self._pendiente.get(clave)
+            self._pendiente[clave] = primer_dia if previo is None else min(previo, primer_dia)
+
+        return len(df)
+
+    def _derivada(self, clave, calcular, rango):
+        """
+        Serie derivada de la tabla diaria, recalculando solo la cola
+
+        Args:
+            clave (str): Nombre de la serie en caché
+            calcular (callable): Tabla diaria -> serie indexada por fecha
+            rango (callable): Primer día pendiente -> (inicio de datos, corte),
+                donde los resultados desde 'corte' dependen solo de días >= inicio
+        """
+        previa = self._derivadas.get(clave)
+        pendiente = self._pendiente.pop(clave, None)
+
+        if previa is None:
+            resultado = calcular(self.diario)
+        elif pendiente is None:
+            return previa
+        else:
+            inicio, corte = rango(pendiente)
+            cola = calcular(self.diario.loc[inicio:])
+            resultado = pd.concat([previa.loc[previa.index < corte], cola.loc[cola.index >= corte]])
+
+        self._derivadas[clave] = resultado
+        return resultado
+
+    def semanal(self):
+        """
+        Conteos semanales (semanas de lunes a domingo, incluidas las sin votaciones)
+
+        Returns:
+            pd.DataFrame: votaciones, aprobadas, rechazadas, margen_medio,
+                abstencion_media, indexado por el lunes de cada semana
+        """
+        def calcular(diario):
+            semanas = diario.resample(FRECUENCIA_SEMANAL, label='left', closed='left').sum()
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return pd.DataFrame({
+                    'votaciones': semanas['votaciones'],
+                    'aprobadas': semanas['aprobadas'],
+                    'rechazadas': semanas['rechazadas'],
+                    'margen_medio': semanas['suma_margen'] / semanas['con_margen'].replace(0, np.nan),
+                    'abstencion_media': semanas['suma_abstencion'] / semanas['con_abstencion'].replace(0, np.nan)
+                })
+
+        def rango(dia):
+            lunes = dia - pd.Timedelta(days=dia.weekday())
+            return lunes, lunes
+
+        return self._derivada('semanal', calcular, rango)
+
+    def diaria(self):
+        """Votaciones por día con votaciones (la tabla diaria sin sumas auxiliares)"""
+        return self.diario[['votaciones', 'aprobadas', 'rechazadas']]
+
+    def tasa_aprobacion_movil(self, ventana=VENTANA_APROBACION):
+        """
+        Tasa de aprobación en una ventana móvil de calendario
+
+        Args:
+            ventana (str): Ventana de pandas (ej: '90D', '365D')
+
+        Returns:
+            pd.Series: aprobadas / (aprobadas + rechazadas) en la ventana que
+                termina en cada día con votaciones
+        """
+        def calcular(diario):
+            suma = diario[['aprobadas', 'rechazadas']].rolling(ventana).sum()
+            decididas = suma['aprobadas'] + suma['rechazadas']
+            return suma['aprobadas'] / decididas.replace(0, np.nan)
+
+        def rango(dia):
+            return dia - pd.Timedelta(ventana), dia
+
+        return self._derivada(f"aprobacion_{ventana}", calcular, rango)
+
+    def densidad_sesiones(self):
+        """
+        Densidad de días de sesión por mes
+
+        Returns:
+            pd.DataFrame: dias_sesion (días con al menos una votación),
+                votaciones y votaciones_por_dia, indexado por el primer día del mes
+        """
+        def calcular(diario):
+            meses = pd.DataFrame({
+                'dias_sesion': (diario['votaciones'] > 0).astype(np.int64),
+                'votaciones': diario['votaciones']
+            }).resample('MS').sum()
+            meses['votaciones_por_dia'] = meses['votaciones'] / meses['dias_sesion'].replace(0, np.nan)
+            return meses
+
+        def rango(dia):
+            mes = dia.replace(day=1)
+            return mes, mes
+
+        return self._derivada('densidad', calcular, rango)
+
+    def distribuciones(self):
+        """
+        Histogramas por año de margen (TotalSi - TotalNo) y tasa de abstención
+
+        Returns:
+            dict: 'margen' y 'abstencion', cada uno con 'bordes' y 'por_anio' (DataFrame)
+        """
+        return {
+            'margen': {'bordes': BORDES_MARGEN, 'por_anio': self.hist_margen},
+            'abstencion': {'bordes': BORDES_ABSTENCION, 'por_anio': self.hist_abstencion}
+        }
+
+    def exportar(self):
+        """
+        Series compactas para los gráficos del sitio
+
+        Las series semanales y mensuales son continuas, así que solo se
+        guarda la fecha de inicio y los valores.
+
+        Returns:
+            dict: Datos serializables a JSON
+        """
+        if self.diario.empty:
+            return {}
+
+        semanal = self.semanal()
+        # Tasa móvil al cierre de cada semana (la última disponible si no hubo votaciones)
+        tasa = (self.tasa_aprobacion_movil()
+                .resample(FRECUENCIA_SEMANAL, label='left', closed='left').last()
+                .ffill().reindex(semanal.index))
+        densidad = self.densidad_sesiones()
+
+        def histogramas(tabla):
+            return {str(anio): fila.tolist() for anio, fila in tabla.iterrows()}
+
+        return {
+            'semanal': {
+                'inicio': semanal.index[0].strftime('%Y-%m-%d'),
+                'votaciones': semanal['votaciones'].tolist(),
+                'aprobadas': semanal['aprobadas'].tolist(),
+                'rechazadas': semanal['rechazadas'].tolist(),
+                'margen_medio': _redondear(semanal['margen_medio'].to_numpy(), 1),
+                'abstencion_media': _redondear(semanal['abstencion_media'].to_numpy(), 3),
+                'aprobacion_movil': _redondear(tasa.to_numpy(), 3),
+                'ventana_aprobacion': VENTANA_APROBACION
+            },
+            'mensual': {
+                'inicio': densidad.index[0].strftime('%Y-%m'),
+                'dias_sesion': densidad['dias_sesion'].tolist(),
+                'votaciones_por_dia': _redondear(densidad['votaciones_por_dia'].to_numpy(), 1)
+            },
+            'distribuciones': {
+                'margen': {
+                    'bordes': BORDES_MARGEN.tolist(),
+                    'por_anio': histogramas(self.hist_margen)
+                },
+                'abstencion': {
+                    'bordes': _redondear(BORDES_ABSTENCION, 2),
+                    'por_anio': histogramas(self.hist_abstencion)
+                }
+            }
+        }
+
+
+def main():
+    """Benchmark: construcción completa vs. agregado incremental de la última parte"""
+    import glob
+    import json
+    import time
+
+    archivos = sorted(glob.glob('data/raw/votaciones_*.json'))
+    if not archivos:
+        print("✗ No se encontraron archivos en data/raw/")
+        return
+
+    votaciones = []
+    for archivo in archivos:
+        with open(archivo, 'r', encoding='utf-8') as f:
+            votaciones.extend(json.load(f))
+    df = pd.DataFrame(votaciones).sort_values('Fecha', kind='stable', ignore_index=True)
+    corte = int(len(df) * 0.98)
+
+    def derivar(series):
+        return (series.semanal(), series.tasa_aprobacion_movil(), series.densidad_sesiones())
+
+    inicio = time.perf_counter()
+    completa = SeriesTemporales()
+    completa.agregar(df)
+    esperadas = derivar(completa)
+    t_completa = time.perf_counter() - inicio
+    exportado = completa.exportar()
+
+    incremental = SeriesTemporales()
+    incremental.agregar(df.iloc[:corte])
+    derivar(incremental)
+    inicio = time.perf_counter()
+    incremental.agregar(df.iloc[corte:])
+    obtenidas = derivar(incremental)
+    t_incremental = time.perf_counter() - inicio
+
+    iguales = all(
+        a.round(9).equals(b.round(9)) for a, b in zip(esperadas, obtenidas)
+    ) and completa.hist_margen.equals(incremental.hist_margen)
+
+    tamano = len(json.dumps(exportado, separators=(',', ':')))
+    print(f"{len(df):,} votaciones, {len(completa.diario):,} días con votaciones, "
+          f"{len(esperadas[0]):,} semanas")
+    print(f"  construcción completa:          {t_completa * 1000:7.1f} ms")
+    print(f"  agregar últimas {len(df) - corte:,} (cola): {t_incremental * 1000:7.1f} ms")
+    print(f"  {'✓' if iguales else '✗'} incremental {'igual' if iguales else 'distinto'} a la construcción completa")
+    print(f"  series.json: {tamano / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Generador de corpus sintéticos a partir de los datos incluidos
+
+Aprende de data/raw/votaciones_YYYY.json las distribuciones empíricas de
+cada año (combinaciones de tipo, quórum y resultado con sus totales,
+días de votación y horas del día) y genera N veces ese volumen por año,
+de forma determinista a partir de una semilla. Escribe:
+
+    <salida>/votaciones_YYYY.json                              (como data/raw)
+    <salida>/archivo/retornarVotacionesXAnno/YYYY/*.xml.gz      (como el API)
+
+El archivo XML tiene el formato de ArchivoXML, así que sirve tanto para
+'rebuild' como para el servidor de prueba (scripts/stub_api.py).
+"""
+
+import glob
+import gzip
+import json
+import os
+import re
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+
+from .endpoints import NAMESPACE, obtener_esquema
+
+
+OPERACION = obtener_esquema('votaciones')['operacion']
+
+# Orden de campos de votaciones_YYYY.json
+CAMPOS = [
+    'Id', 'Descripcion', 'Fecha', 'TotalSi', 'TotalNo', 'TotalAbstencion', 'TotalDispensado',
+    'Quorum_Valor', 'Quorum', 'Resultado_Valor', 'Resultado', 'Tipo_Valor', 'Tipo'
+]
+CAMPOS_TEXTO = ['Id', 'Descripcion', 'Fecha', 'TotalSi', 'TotalNo', 'TotalAbstencion', 'TotalDispensado']
+CAMPOS_CON_VALOR = ['Quorum', 'Resultado', 'Tipo']
+
+# Número del boletín dentro de la descripción (ver boletines.PATRON_BOLETIN)
+PATRON_NUMERO_BOLETIN = re.compile(r'(Bolet[ií]n\s+N[°º]?\s*)(\d+)')
+
+# Cada réplica de un boletín real se desplaza en este múltiplo, para que
+# el número de votaciones por proyecto se mantenga al escalar
+DESPLAZAMIENTO_BOLETIN = 100000
+
+# Filas generadas y escritas por lote (acota la memoria a cualquier escala)
+TAMANO_LOTE = 50000
+
+# Nombre fijo de la versión archivada, para una salida reproducible
+VERSION_ARCHIVO = '00000000_000000.xml.gz'
+
+
+class ModeloVotaciones:
+    """Distribuciones empíricas por año, aprendidas de los JSON anuales"""
+
+    def __init__(self, por_anio):
+        self.por_anio = por_anio
+
+    @classmethod
+    def aprender(cls, directorio='data/raw'):
+        """
+        Aprende el modelo desde los votaciones_YYYY.json de un directorio
+
+        Args:
+            directorio (str): Directorio con los JSON anuales
+
+        Returns:
+            ModeloVotaciones: Modelo con un conjunto de distribuciones por año
+        """
+        por_anio = {}
+        for archivo in sorted(glob.glob(os.path.join(directorio, 'votaciones_*.json'))):
+            anno = int(os.path.basename(archivo)[len('votaciones_'):-len('.json')])
+            with open(archivo, 'r', encoding='utf-8') as f:
+                df = pd.DataFrame(json.load(f))
+            fechas = pd.to_datetime(df['Fecha'], errors='coerce')
+            df = df.loc[fechas.notna()].reset_index(drop=True)
+            fechas = fechas[fechas.notna()].reset_index(drop=True)
+            if df.empty:
+                continue
+
+            # Boletín: prefijo, número y resto de la descripción
+            partes = df['Descripcion'].fillna('').str.extract(r'^(.*?Bolet[ií]n\s+N[°º]?\s*)(\d+)(.*)$', expand=True)
+            es_boletin = partes[1].notna().to_numpy()
+
+            por_anio[anno] = {
+                # Fuente conjunta: tipo, quórum, resultado y totales de cada votación real
+                'filas': df.reindex(columns=CAMPOS).fillna('').astype(str),
+                'es_boletin': es_boletin,
+                'prefijo': partes[0].fillna('').to_numpy(dtype=object),
+                'numero': pd.to_numeric(partes[1], errors='coerce').fillna(0).to_numpy(dtype=np.int64),
+                'resto': partes[2].fillna('').to_numpy(dtype=object),
+                # Día de cada votación real y horas del día observadas en el año
+                'dias': fechas.dt.normalize().to_numpy().astype('datetime64[s]'),
+                'segundos': (fechas - fechas.dt.normalize()).dt.total_seconds().to_numpy(dtype=np.int64),
+            }
+        return cls(por_anio)
+
+    def annos(self):
+        return sorted(self.por_anio)
+
+    def total(self, anno, escala):
+        return len(self.por_anio[anno]['filas']) * escala
+
+    def muestrear(self, anno, escala, rng):
+        """
+        Muestra numérica de un año: votación real de origen, réplica y hora
+
+        Solo arreglos de enteros, para que ordenar por fecha sea barato a
+        cualquier escala; el texto se arma por lotes en lote().
+
+        Returns:
+            dict: 'origen', 'replica' y 'fecha' (datetime64[s]), ordenados por fecha
+        """
+        datos = self.por_anio[anno]
+        n_reales = len(datos['filas'])
+        n = n_reales * escala
+
+        origen = rng.integers(0, n_reales, n)
+        replica = rng.integers(0, escala, n)
+        # Mismo día que la votación de origen (respeta el tamaño de la Cámara
+        # de esa fecha) y una hora observada en el año
+        segundos = datos['segundos'][rng.integers(0, n_reales, n)]
+        fecha = datos['dias'][origen] + segundos.astype('timedelta64[s]')
+
+        orden = np.argsort(fecha, kind='stable')
+        return {'origen': origen[orden], 'replica': replica[orden], 'fecha': fecha[orden]}
+
+    def lote(self, anno, muestra, inicio, fin, primer_id):
+        """
+        Arma las votaciones [inicio, fin) de una muestra como DataFrame de texto
+
+        Args:
+            anno (int): Año
+            muestra (dict): Resultado de muestrear()
+            inicio (int): Primera fila del lote
+            fin (int): Fila siguiente a la última
+            primer_id (int): Id de la primera votación del año
+
+        Returns:
+            pd.DataFrame: Columnas CAMPOS, todo como texto (formato del API)
+        """
+        datos = self.por_anio[anno]
+        origen = muestra['origen'][inicio:fin]
+        replica = muestra['replica'][inicio:fin]
+
+        lote = datos['filas'].iloc[origen].reset_index(drop=True)
+        lote['Id'] = (primer_id + np.arange(inicio, fin)).astype(str)
+        lote['Fecha'] = np.datetime_as_string(muestra['fecha'][inicio:fin], unit='s')
+
+        # Boletines renumerados por réplica (la réplica 0 conserva el número real)
+        boletin = datos['es_boletin'][origen] & (replica > 0)
+        if boletin.any():
+            numero = datos['numero'][origen[boletin]] + replica[boletin] * DESPLAZAMIENTO_BOLETIN
+            lote.loc[boletin, 'Descripcion'] = (
+                pd.Series(datos['prefijo'][origen[boletin]])
+                + pd.Series(numero).astype(str)
+                + pd.Series(datos['resto'][origen[boletin]])
+            ).to_numpy()
+        return lote
+
+
+def _json_lote(lote):
+    """Registros de un lote como fragmento de arreglo JSON (sin corchetes)"""
+    return lote.to_json(orient='records', force_ascii=False)[1:-1]
+
+
+def _xml_lote(lote):
+    """Elementos <Votacion> de un lote"""
+    columnas = {c: lote[c].tolist() for c in CAMPOS}
+    partes = []
+    for i in range(len(lote)):
+        campos = ''.join(
+            f"<{c}>{escape(columnas[c][i])}</{c}>" for c in CAMPOS_TEXTO
+        ) + ''.join(
+            f'<{c} Valor="{escape(columnas[c + "_Valor"][i])}">{escape(columnas[c][i])}</{c}>'
+            for c in CAMPOS_CON_VALOR
+        )
+        partes.append(f"<Votacion>{campos}</Votacion>")
+    return ''.join(partes)
+
+
+def generar(escala=10, semilla=42, salida=None, directorio='data/raw',
+            formatos=('json', 'xml'), annos=None):
+    """
+    Genera un corpus sintético N veces mayor que el real
+
+    Args:
+        escala (int): Factor de volumen por año (ej: 10, 100, 1000)
+        semilla (int): Semilla; la misma semilla y escala dan la misma salida
+        salida (str): Directorio de salida (por defecto data/sintetico/x<escala>)
+        directorio (str): Directorio con los JSON reales
+        formatos (tuple): 'json' y/o 'xml'
+        annos (list): Años a generar (por defecto todos los aprendidos)
+
+    Returns:
+        dict: Año -> votaciones generadas
+    """
+    salida = salida or f"data/sintetico/x{escala}"
+    modelo = ModeloVotaciones.aprender(directorio)
+    annos = [a for a in modelo.annos() if not annos or a in annos]
+    if not annos:
+        print(f"✗ No se encontraron votaciones en {directorio}/")
+        return {}
+
+    print(f"Generando corpus x{escala} (semilla {semilla}) en {salida}/")
+    os.makedirs(salida, exist_ok=True)
+
+    # Ids únicos y crecientes en el tiempo, asignados en orden de año
+    primer_id = 1
+    generados = {}
+    for anno in modelo.annos():
+        total = modelo.total(anno, escala)
+        if anno not in annos:
+            primer_id += total
+            continue
+
+        rng = np.random.default_rng([semilla, anno])
+        muestra = modelo.muestrear(anno, escala, rng)
+        escritores = _abrir_escritores(salida, anno, formatos)
+
+        # Más recientes primero, como en data/raw
+        for fin in range(total, 0, -TAMANO_LOTE):
+            inicio = max(0, fin - TAMANO_LOTE)
+            lote = modelo.lote(anno, muestra, inicio, fin, primer_id).iloc[::-1]
+            for formato, (f, primero) in escritores.items():
+                texto = _json_lote(lote) if formato == 'json' else _xml_lote(lote)
+                if formato == 'json' and not primero:
+                    texto = ',' + texto
+                f.write(texto.encode('utf-8'))
+                escritores[formato] = (f, False)
+
+        _cerrar_escritores(escritores)
+        generados[anno] = total
+        primer_id += total
+        print(f"  ✓ {anno}: {total:,} votaciones")
+
+    print(f"✅ {sum(generados.values()):,} votaciones sintéticas")
+    return generados
+
+
+def _abrir_escritores(salida, anno, formatos):
+    """Archivos de salida de un año: formato -> (archivo binario, es_primer_lote)"""
+    escritores = {}
+    if 'json' in formatos:
+        f = open(os.path.join(salida, f"votaciones_{anno}.json"), 'wb')
+        f.write(b'[')
+        escritores['json'] = (f, True)
+    if 'xml' in formatos:
+        directorio = os.path.join(salida, 'archivo', OPERACION, str(anno))
+        os.makedirs(directorio, exist_ok=True)
+        # mtime=0: el .gz no depende del momento en que se genera
+        f = gzip.GzipFile(os.path.join(directorio, VERSION_ARCHIVO), 'wb', compresslevel=6, mtime=0)
+        f.write(f'<?xml version="1.0" encoding="utf-8"?>'
+                f'<Votaciones xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                f'xmlns="{NAMESPACE}">'.encode('utf-8'))
+        escritores['xml'] = (f, True)
+    return escritores
+
+
+def _cerrar_escritores(escritores):
+    for formato, (f, _) in escritores.items():
+        f.write(b']' if formato == 'json' else b'</Votaciones>')
+        f.close()
+
+
+def main():
+    """Función principal para testing: genera x10 y verifica la salida"""
+    import contextlib
+    import io
+    import tempfile
+    import time
+
+    from .api_client import iterar_votaciones_xml
+    from .validacion import validar_votaciones
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        generados = generar(escala=10, semilla=7, salida=tmp)
+        duracion = time.perf_counter() - inicio
+        if not generados:
+            return
+        total = sum(generados.values())
+        print(f"  {total / duracion:,.0f} votaciones/s (JSON + XML)")
+
+        votaciones = []
+        for anno in generados:
+            with open(os.path.join(tmp, f"votaciones_{anno}.json"), 'r', encoding='utf-8') as f:
+                votaciones.extend(json.load(f))
+
+        # El XML debe parsear a exactamente lo mismo que el JSON
+        anno = max(generados)
+        with open(os.path.join(tmp, f"votaciones_{anno}.json"), 'r', encoding='utf-8') as f:
+            esperado = json.load(f)
+        ruta_xml = os.path.join(tmp, 'archivo', OPERACION, str(anno), VERSION_ARCHIVO)
+        iguales = list(iterar_votaciones_xml(ruta_xml)) == esperado
+        print(f"  {'✓' if iguales else '✗'} XML {anno} parsea igual que el JSON")
+
+        # Misma semilla, misma salida
+        otra = os.path.join(tmp, 'repeticion')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generar(escala=10, semilla=7, salida=otra, annos=[anno])
+        with open(os.path.join(otra, f"votaciones_{anno}.json"), 'rb') as f:
+            repetido = json.load(f) == esperado
+        print(f"  {'✓' if repetido else '✗'} Salida determinista con la misma semilla")
+
+        errores = [v for v in validar_votaciones(votaciones) if v['nivel'] == 'error']
+        print(f"  {'✓' if not errores else '✗'} Validación: "
+              f"{'sin errores' if not errores else ', '.join(v['regla'] for v in errores)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Servidor local que imita el API de la Cámara a partir de un archivo XML
+
+Responde a /<Servicio>.asmx/<operacion> con la última versión archivada
+de la consulta (ArchivoXML, misma clave que CamaraAPI), con latencia y
+tasa de error configurables. Sirve tanto el archivo real (data/raw/archivo)
+como un corpus sintético (scripts/sintetico.py), para probar CamaraAPI,
+update_data y DataProcessor sin red y a escala de producción:
+
+    python -m scripts sintetico --escala 100
+    python -m scripts stub --directorio data/sintetico/x100/archivo --latencia 0.3
+    CAMARA_API_URL=http://127.0.0.1:8765 python -m scripts fetch
+"""
+
+import os
+import random
+import shutil
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from .archivo import ArchivoXML
+
+
+PUERTO = 8765
+
+# Bytes por escritura al enviar un archivo
+TAMANO_BLOQUE = 1 << 16
+
+
+class ServidorStub(ThreadingHTTPServer):
+    """Servidor HTTP concurrente con el archivo y la configuración de la simulación"""
+
+    daemon_threads = True
+
+    def __init__(self, direccion, archivo, latencia=0.0, jitter=0.0, tasa_error=0.0,
+                 semilla=0, verbose=False):
+        super().__init__(direccion, _Manejador)
+        self.archivo = archivo
+        self.latencia = latencia
+        self.jitter = jitter
+        self.tasa_error = tasa_error
+        self.verbose = verbose
+        self.peticiones = 0
+        self.bytes_enviados = 0
+        self._rng = random.Random(semilla)
+        self._lock = threading.Lock()
+
+    def sortear(self):
+        """Demora y si la respuesta falla, sorteadas para una petición"""
+        with self._lock:
+            self.peticiones += 1
+            demora = self.latencia + self._rng.uniform(0, self.jitter)
+            falla = self._rng.random() < self.tasa_error
+        return demora, falla
+
+    @property
+    def url(self):
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._responder(dict(parse_qsl(urlsplit(self.path).query)))
+
+    def do_POST(self):
+        largo = int(self.headers.get('Content-Length') or 0)
+        cuerpo = self.rfile.read(largo).decode('utf-8') if largo else ''
+        self._responder(dict(parse_qsl(cuerpo)))
+
+    def _responder(self, params):
+        from .api_client import _clave_consulta
+
+        servidor = self.server
+        demora, falla = servidor.sortear()
+        if demora:
+            time.sleep(demora)
+        if falla:
+            self._error(503, 'Servicio no disponible (simulado)')
+            return
+
+        # /WSLegislativo.asmx/retornarVotacionesXAnno
+        partes = urlsplit(self.path).path.strip('/').split('/')
+        if len(partes) != 2 or not partes[0].endswith('.asmx'):
+            self._error(404, 'Ruta no reconocida')
+            return
+        operacion = partes[1]
+        clave = _clave_consulta(params)
+
+        ruta = servidor.archivo.ultima_version(operacion, clave)
+        if ruta is None:
+            self._error(404, f"Sin datos archivados para {operacion} ({clave})")
+            return
+
+        # El archivo ya está en gzip: se envía tal cual si el cliente lo acepta
+        comprimido = 'gzip' in self.headers.get('Accept-Encoding', '')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml; charset=utf-8')
+        if comprimido:
+            self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(os.path.getsize(ruta)))
+        else:
+            self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        with open(ruta, 'rb') as f:
+            if comprimido:
+                shutil.copyfileobj(f, self.wfile, TAMANO_BLOQUE)
+                enviados = os.path.getsize(ruta)
+            else:
+                enviados = self._enviar_descomprimido(f)
+        with servidor._lock:
+            servidor.bytes_enviados += enviados
+
+    def _enviar_descomprimido(self, f):
+        """Descomprime en streaming, en trozos HTTP (sin cargar el XML completo)"""
+        descompresor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        enviados = 0
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b''):
+            datos = descompresor.decompress(bloque)
+            if datos:
+                self.wfile.write(f"{len(datos):x}\r\n".encode('ascii') + datos + b"\r\n")
+                enviados += len(datos)
+        datos = descompresor.flush()
+        if datos:
+            self.wfile.write(f"{len(datos):x}\r\n".encode('ascii') + datos + b"\r\n")
+            enviados += len(datos)
+        self.wfile.write(b"0\r\n\r\n")
+        return enviados
+
+    def _error(self, codigo, mensaje):
+        cuerpo = mensaje.encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        if self.server.verbose:
+            super().log_message(formato, *args)
+
+
+def crear_servidor(directorio='data/raw/archivo', puerto=PUERTO, host='127.0.0.1',
+                   latencia=0.0, jitter=0.0, tasa_error=0.0, semilla=0, verbose=False):
+    """
+    Crea el servidor de prueba (sin iniciarlo)
+
+    Args:
+        directorio (str): Raíz de un ArchivoXML (real o sintético)
+        puerto (int): Puerto TCP (0 elige uno libre)
+        host (str): Interfaz en la que escuchar
+        latencia (float): Segundos de demora fija por petición
+        jitter (float): Segundos de demora adicional, uniforme entre 0 y este valor
+        tasa_error (float): Fracción de peticiones que responden 503
+        semilla (int): Semilla del sorteo de demoras y errores
+        verbose (bool): Registrar cada petición
+
+    Returns:
+        ServidorStub: Servidor listo para serve_forever()
+    """
+    return ServidorStub((host, puerto), ArchivoXML(directorio), latencia=latencia,
+                        jitter=jitter, tasa_error=tasa_error, semilla=semilla,
+                        verbose=verbose)
+
+
+def iniciar_en_segundo_plano(**kwargs):
+    """
+    Inicia el servidor en un hilo, para pruebas y benchmarks
+
+    Args:
+        **kwargs: Argumentos de crear_servidor (por defecto en un puerto libre)
+
+    Returns:
+        ServidorStub: Servidor en marcha; detener con shutdown()
+    """
+    kwargs.setdefault('puerto', 0)
+    servidor = crear_servidor(**kwargs)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+def main():
+    """Benchmark: descarga de un corpus sintético x5 con latencia simulada"""
+    import contextlib
+    import io
+    import tempfile
+
+    from .api_client import CamaraAPI
+    from .sintetico import generar
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sintetico = os.path.join(tmp, 'sintetico')
+        annos = list(range(2016, 2026))
+        with contextlib.redirect_stdout(io.StringIO()):
+            generados = generar(escala=5, semilla=1, salida=sintetico, formatos=('xml',), annos=annos)
+        if not generados:
+            print("✗ No se encontraron votaciones en data/raw/")
+            return
+        print(f"{sum(generados.values()):,} votaciones sintéticas en {len(generados)} años (x5)")
+
+        servidor = iniciar_en_segundo_plano(directorio=os.path.join(sintetico, 'archivo'),
+                                            latencia=0.2, jitter=0.1)
+        try:
+            for workers in (1, 4, 8):
+                api = CamaraAPI(output_dir=os.path.join(tmp, f"raw_{workers}"),
+                                servicios_url=servidor.url)
+                inicio = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    resultados = api.descargar('votaciones', [{'anno': a} for a in generados],
+                                               workers=workers)
+                duracion = time.perf_counter() - inicio
+                total = sum(len(registros) for _, registros in resultados)
+                estado = '✓' if total == sum(generados.values()) else '✗'
+                print(f"  {estado} {workers} workers: {total:,} votaciones en {duracion:5.2f} s "
+                      f"({total / duracion:,.0f}/s)")
+            print(f"  {servidor.peticiones} peticiones, "
+                  f"{servidor.bytes_enviados / 1024 ** 2:.1f} MB enviados")
+        finally:
+            servidor.shutdown()
+            servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
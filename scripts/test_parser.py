@@ -3,22 +3,27 @@ Script para probar el parsing de los archivos XML existentes
 """
 
 import os
-import sys
 import glob
 import json
 import xml.etree.ElementTree as ET
 
-sys.path.insert(0, os.path.dirname(__file__))
-from api_client import CamaraAPI
+from .api_client import CamaraAPI
+from .archivo import abrir_xml
 
 
 def listar_archivos_xml(directorio='data/raw'):
-    """Lista todos los archivos XML en el directorio"""
-    patron = f"{directorio}/*.xml"
-    archivos = glob.glob(patron)
+    """Lista todos los archivos XML en el directorio, incluido el archivo comprimido"""
+    archivos = glob.glob(f"{directorio}/*.xml")
+    archivos += sorted(glob.glob(f"{directorio}/archivo/**/*.xml.gz", recursive=True))
     return archivos
 
 
+def leer_xml(filepath):
+    """Lee un archivo XML, descomprimiendo si es .gz"""
+    with abrir_xml(filepath) as f:
+        return f.read().decode('utf-8')
+
+
 def parsear_archivo_xml_directo(filepath):
     """
     Parsea un archivo XML directamente sin usar la clase
@@ -28,8 +33,7 @@ def parsear_archivo_xml_directo(filepath):
     print(f"PARSEANDO: {filepath}")
     print('='*70)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        xml_content = f.read()
+    xml_content = leer_xml(filepath)
     
     try:
         # Namespace correcto
@@ -101,8 +105,7 @@ def probar_con_api_client(filepath):
     
     api = CamaraAPI()
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        xml_content = f.read()
+    xml_content = leer_xml(filepath)
     
     # Explorar estructura
     api.explorar_xml(xml_content)
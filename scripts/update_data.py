@@ -1,76 +1,185 @@
 """
 Script principal para actualizar datos del sitio web
 Este script orquesta la recolección y procesamiento de datos
+
+Al importarlo solo se carga la biblioteca estándar: requests, numpy y
+pandas (a través de validacion, series y boletines) se importan dentro
+de las funciones que los usan.
 """
 
-import sys
+import glob
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-# Añadir el directorio scripts al path
-sys.path.insert(0, os.path.dirname(__file__))
-
-from api_client import CamaraAPI
-from data_processor import DataProcessor
+from .archivo import ArchivoXML
+from .endpoints import obtener_esquema, reconstruir_json
+from .publicacion import publicar_versionado
 import json
 import shutil
 
 
-def actualizar_datos_votaciones(annos=[2023, 2024]):
+ENDPOINT_VOTACIONES = obtener_esquema('votaciones')['operacion']
+
+
+def actualizar_datos_votaciones(annos=[2023, 2024], workers=4, output_dir='data/raw'):
     """
     Actualiza datos de votaciones para los años especificados
     
     Args:
         annos (list): Lista de años a consultar
+        workers (int): Consultas simultáneas al API
+        output_dir (str): Directorio de los JSON por año y del archivo comprimido
     """
     print("="*70)
     print("ACTUALIZANDO DATOS DE VOTACIONES")
     print("="*70)
     
-    api = CamaraAPI(output_dir='data/raw')
-    processor = DataProcessor(input_dir='data/raw', output_dir='data/processed')
+    from .api_client import CamaraAPI
+    
+    api = CamaraAPI(output_dir=output_dir)
     
     todas_votaciones = []
-    total_annos = len(annos)
     
-    for idx, anno in enumerate(annos, 1):
-        print(f"\n📅 [{idx}/{total_annos}] Procesando año {anno}...")
+    # Descarga concurrente; cada año se guarda en votaciones_YYYY.json
+    resultados = api.descargar('votaciones', [{'anno': anno} for anno in annos], workers=workers)
+    
+    for params, votaciones in resultados:
+        anno = params['anno']
+        if votaciones:
+            todas_votaciones.extend(votaciones)
+            print(f"  ✓ {len(votaciones)} votaciones del año {anno}")
+        else:
+            print(f"  ⚠️  No se obtuvieron votaciones para {anno}")
+    
+    print(f"\n{'='*70}")
+    print(f"✅ TOTAL ACUMULADO: {len(todas_votaciones)} votaciones")
+    print(f"{'='*70}")
+    
+    return todas_votaciones
+
+
+def cargar_votaciones_raw(directorio='data/raw'):
+    """
+    Carga todos los votaciones_YYYY.json de un directorio
+    
+    Args:
+        directorio (str): Directorio de los JSON por año
         
-        # Obtener datos del API
-        xml_data = api.obtener_votaciones_por_anno(anno)
+    Returns:
+        list: Votaciones de todos los años, en orden de año
+    """
+    votaciones = []
+    for archivo in sorted(glob.glob(f"{directorio}/votaciones_*.json")):
+        with open(archivo, 'r', encoding='utf-8') as f:
+            votaciones.extend(json.load(f))
+    return votaciones
+
+
+def reconstruir_desde_archivo(annos=None, workers=None,
+                              archivo_dir='data/raw/archivo', output_dir='data/raw'):
+    """
+    Regenera los JSON por año desde el archivo XML comprimido, sin red
+    
+    Cada año se parsea en paralelo en su propio proceso (con
+    endpoints.reconstruir_json, que solo usa la biblioteca estándar).
+    
+    Args:
+        annos (list): Años a reconstruir (por defecto todos los archivados)
+        workers (int): Número de procesos (por defecto uno por núcleo)
+        archivo_dir (str): Directorio del archivo comprimido
+        output_dir (str): Directorio de los JSON por año
         
-        if xml_data:
-            # Parsear XML
-            votaciones = api.parsear_xml_votaciones(xml_data)
-            
-            if votaciones:
-                # Guardar JSON individual por año
-                api.guardar_json(votaciones, f'votaciones_{anno}.json')
-                todas_votaciones.extend(votaciones)
-                print(f"  ✓ {len(votaciones)} votaciones del año {anno}")
-            else:
-                print(f"  ⚠️  No se encontraron votaciones para {anno}")
+    Returns:
+        list: Todas las votaciones reconstruidas
+    """
+    print("="*70)
+    print("RECONSTRUYENDO DATOS DESDE ARCHIVO")
+    print("="*70)
+    
+    archivo = ArchivoXML(archivo_dir)
+    annos = [str(a) for a in annos] if annos else archivo.claves(ENDPOINT_VOTACIONES)
+    
+    tareas = []
+    for anno in annos:
+        ruta = archivo.ultima_version(ENDPOINT_VOTACIONES, anno)
+        if ruta:
+            tareas.append((ruta, anno))
         else:
-            print(f"  ⚠️  No se pudieron obtener datos de {anno}")
-        
-        # Pequeña pausa para no sobrecargar el API
-        if idx < total_annos:
-            import time
-            time.sleep(0.5)
+            print(f"  ⚠️  No hay versión archivada para {anno}")
+    
+    if not tareas:
+        print("✗ El archivo no contiene votaciones")
+        return []
+    
+    os.makedirs(output_dir, exist_ok=True)
+    todas_votaciones = []
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futuros = [
+            executor.submit(reconstruir_json, ruta, 'votaciones', {'anno': anno}, output_dir)
+            for ruta, anno in tareas
+        ]
+        # Recoger en orden de año para un resultado determinista
+        for (_, anno), futuro in zip(tareas, futuros):
+            votaciones = futuro.result()
+            todas_votaciones.extend(votaciones)
+            print(f"  ✓ {len(votaciones)} votaciones del año {anno}")
     
     print(f"\n{'='*70}")
-    print(f"✅ TOTAL ACUMULADO: {len(todas_votaciones)} votaciones")
+    print(f"✅ TOTAL RECONSTRUIDO: {len(todas_votaciones)} votaciones")
     print(f"{'='*70}")
     
     return todas_votaciones
 
 
-def generar_datos_para_sitio(votaciones):
+def validar_antes_de_publicar(votaciones, stats_previas_path='docs/data/stats_por_anio.json'):
+    """
+    Valida el corpus contra las reglas de calidad y la publicación anterior
+    
+    Args:
+        votaciones (list): Lista de votaciones
+        stats_previas_path (str): stats_por_anio.json publicado actualmente
+        
+    Returns:
+        bool: True si se puede publicar
+    """
+    print("\n" + "="*70)
+    print("VALIDANDO DATOS")
+    print("="*70)
+    
+    from .validacion import validar_votaciones, reportar_violaciones
+    
+    stats_previas = None
+    if os.path.exists(stats_previas_path):
+        with open(stats_previas_path, 'r', encoding='utf-8') as f:
+            stats_previas = json.load(f)
+    
+    violaciones = validar_votaciones(votaciones, stats_previas=stats_previas)
+    return reportar_violaciones(violaciones)
+
+
+def _orden_reciente(votacion):
+    """
+    Clave para ordenar las votaciones publicadas (con reverse=True, más recientes primero)
+
+    A igual Fecha se desempata por Id (primero por largo, así los Ids
+    numéricos quedan en orden numérico), igual que compararRecientes en
+    docs/js/datos-worker.js: el sitio y los clientes que aplican registros
+    de cambios cortan la ventana en las mismas votaciones.
+    """
+    id_votacion = votacion.get('Id')
+    id_votacion = '' if id_votacion is None else str(id_votacion)
+    return (votacion.get('Fecha') or '', len(id_votacion), id_votacion)
+
+
+def generar_datos_para_sitio(votaciones, directorio='docs/data'):
     """
     Genera archivos JSON optimizados para el sitio web
     
     Args:
         votaciones (list): Lista de votaciones
+        directorio (str): Directorio de datos del sitio
     """
     print("\n" + "="*70)
     print("GENERANDO DATOS PARA SITIO WEB")
@@ -80,15 +189,17 @@ def generar_datos_para_sitio(votaciones):
         print("✗ No hay votaciones para procesar")
         return
     
-    # Crear directorio docs/data si no existe
-    os.makedirs('docs/data', exist_ok=True)
+    import numpy as np
     
-    # Ordenar votaciones por fecha (más recientes primero)
-    votaciones_ordenadas = sorted(
-        votaciones, 
-        key=lambda x: x.get('Fecha', ''), 
-        reverse=True
-    )
+    from .boletines import IndiceBoletines
+    from .clasificacion import Desenlace, clasificar_votaciones
+    from .series import SeriesTemporales
+    
+    # Crear directorio de datos si no existe
+    os.makedirs(directorio, exist_ok=True)
+    
+    # Ordenar votaciones por fecha (más recientes primero; empates por Id)
+    votaciones_ordenadas = sorted(votaciones, key=_orden_reciente, reverse=True)
     
     # 1. Datos completos (limitados a últimas 1000)
     datos_completos = {
@@ -102,33 +213,36 @@ def generar_datos_para_sitio(votaciones):
         'votaciones': votaciones_ordenadas[:1000]  # Últimas 1000 para el sitio
     }
     
-    with open('docs/data/votaciones.json', 'w', encoding='utf-8') as f:
+    with open(f"{directorio}/votaciones.json", 'w', encoding='utf-8') as f:
         json.dump(datos_completos, f, ensure_ascii=False, indent=2)
-    print(f"✓ Generado: docs/data/votaciones.json ({len(datos_completos['votaciones'])} votaciones)")
-    
-    # 2. Estadísticas por año
-    stats_por_anio = {}
-    for v in votaciones:
-        if v.get('Fecha'):
-            anio = v['Fecha'][:4]
-            if anio not in stats_por_anio:
-                stats_por_anio[anio] = {
-                    'total': 0,
-                    'aprobados': 0,
-                    'rechazados': 0
-                }
-            stats_por_anio[anio]['total'] += 1
-            
-            if v.get('Resultado'):
-                if 'aprobado' in v['Resultado'].lower():
-                    stats_por_anio[anio]['aprobados'] += 1
-                elif 'rechazado' in v['Resultado'].lower():
-                    stats_por_anio[anio]['rechazados'] += 1
+    print(f"✓ Generado: {directorio}/votaciones.json ({len(datos_completos['votaciones'])} votaciones)")
+    
+    # 2. Estadísticas por año (clasificación por código, no por etiqueta)
+    desenlaces = clasificar_votaciones(votaciones)
+    anios_votacion = np.array([(v.get('Fecha') or '')[:4] for v in votaciones])
+    con_fecha = anios_votacion != ''
+    
+    anios, indice_anio = np.unique(anios_votacion[con_fecha], return_inverse=True)
+    desenlaces_con_fecha = desenlaces[con_fecha]
+    totales = np.bincount(indice_anio, minlength=len(anios))
+    aprobados = np.bincount(indice_anio, weights=desenlaces_con_fecha == Desenlace.APROBADO,
+                            minlength=len(anios))
+    rechazados = np.bincount(indice_anio, weights=desenlaces_con_fecha == Desenlace.RECHAZADO,
+                             minlength=len(anios))
+    
+    stats_por_anio = {
+        str(anio): {
+            'total': int(total),
+            'aprobados': int(aprob),
+            'rechazados': int(rech)
+        }
+        for anio, total, aprob, rech in zip(anios, totales, aprobados, rechazados)
+    }
     
     # Guardar estadísticas por año para gráficos
-    with open('docs/data/stats_por_anio.json', 'w', encoding='utf-8') as f:
+    with open(f"{directorio}/stats_por_anio.json", 'w', encoding='utf-8') as f:
         json.dump(stats_por_anio, f, ensure_ascii=False, indent=2)
-    print(f"✓ Generado: docs/data/stats_por_anio.json")
+    print(f"✓ Generado: {directorio}/stats_por_anio.json")
     
     # 3. Estadísticas resumen
     stats = {
@@ -142,13 +256,13 @@ def generar_datos_para_sitio(votaciones):
         'campos_disponibles': list(votaciones[0].keys()) if votaciones else []
     }
     
-    with open('docs/data/estadisticas.json', 'w', encoding='utf-8') as f:
+    with open(f"{directorio}/estadisticas.json", 'w', encoding='utf-8') as f:
         json.dump(stats, f, ensure_ascii=False, indent=2)
-    print(f"✓ Generado: docs/data/estadisticas.json")
+    print(f"✓ Generado: {directorio}/estadisticas.json")
     
     # 4. Resumen ejecutivo
-    total_aprobados = sum(1 for v in votaciones if v.get('Resultado', '').lower().find('aprobado') >= 0)
-    total_rechazados = sum(1 for v in votaciones if v.get('Resultado', '').lower().find('rechazado') >= 0)
+    total_aprobados = int(np.count_nonzero(desenlaces == Desenlace.APROBADO))
+    total_rechazados = int(np.count_nonzero(desenlaces == Desenlace.RECHAZADO))
     
     print(f"\n📊 RESUMEN:")
     print(f"  • Total votaciones: {len(votaciones):,}")
@@ -183,6 +297,11 @@ def generar_datos_para_sitio(votaciones):
 
 - `votaciones.json`: Últimas 1000 votaciones con todos los detalles
 - `estadisticas.json`: Estadísticas agregadas y metadata
+- `boletines/indice.json`: Resumen de cada proyecto de ley (por número de boletín)
+- `boletines/<N>.json`: Línea de tiempo de votaciones de los boletines N000 a N999
+- `series.json`: Series semanales y mensuales (votaciones, aprobación móvil, margen, abstención, días de sesión) y distribuciones por año
+- `manifest.json`: Versión vigente; apunta a las copias inmutables en `v/` (nombre con hash del contenido), incluidos el índice y los shards de `boletines/`
+- `cambios/<desde>-<hasta>.json`: Votaciones que entraron, cambiaron o salieron de `votaciones.json` entre dos versiones (no se genera si pesa más que el archivo completo)
 
 ## Fuente
 
@@ -193,9 +312,41 @@ Datos obtenidos de [OpenData Cámara de Diputados](https://opendata.camara.cl/)
 *Datos actualizados automáticamente por scripts/update_data.py*
 """
     
-    with open('docs/data/README.md', 'w', encoding='utf-8') as f:
+    with open(f"{directorio}/README.md", 'w', encoding='utf-8') as f:
         f.write(readme_content)
-    print("✓ Generado: docs/data/README.md")
+    print(f"✓ Generado: {directorio}/README.md")
+    
+    # 6. Índice de proyectos por boletín
+    indice = IndiceBoletines.construir(votaciones)
+    shards = indice.exportar(f"{directorio}/boletines")
+    print(f"✓ Generado: {directorio}/boletines/ ({len(indice):,} proyectos en {shards} archivos)")
+    
+    # 7. Series de tiempo para los gráficos
+    series = SeriesTemporales()
+    series.agregar(votaciones)
+    datos_series = series.exportar()
+    with open(f"{directorio}/series.json", 'w', encoding='utf-8') as f:
+        json.dump(datos_series, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"✓ Generado: {directorio}/series.json ({len(datos_series['semanal']['votaciones']):,} semanas)")
+    
+    # 8. Copias con hash de contenido, manifiesto y registro de cambios
+    manifiesto = publicar_versionado(
+        {
+            'estadisticas': stats,
+            'stats_por_anio': stats_por_anio,
+            'votaciones': datos_completos,
+            'series': datos_series,
+            'boletines/indice': indice.datos_indice(),
+            **{f"boletines/{shard}": proyectos for shard, proyectos in indice.shards().items()}
+        },
+        directorio=directorio,
+        limite_votaciones=1000
+    )
+    print(f"✓ Generado: {directorio}/manifest.json (versión {manifiesto['version']})")
+    if manifiesto['cambios'] and manifiesto['cambios'][-1]['hasta'] == manifiesto['version']:
+        c = manifiesto['cambios'][-1]
+        print(f"  • Cambios en la ventana: {c['agregadas']:,} entraron, {c['modificadas']:,} modificadas, "
+              f"{c['eliminadas']:,} salieron")
 
 
 def explorar_estructura_datos(votaciones):
@@ -223,40 +374,87 @@ def explorar_estructura_datos(votaciones):
         print(f"  • {key} ({tipo_valor}): {preview}")
 
 
-def main():
-    """Función principal"""
+def publicar(votaciones, forzar=False, directorio='docs/data'):
+    """
+    Valida las votaciones y, si no hay errores, genera los datos del sitio
+    
+    Args:
+        votaciones (list): Lista de votaciones
+        forzar (bool): Publicar aunque la validación encuentre errores
+        directorio (str): Directorio de datos del sitio
+        
+    Returns:
+        bool: True si se publicó
+    """
+    stats_previas = os.path.join(directorio, 'stats_por_anio.json')
+    if not validar_antes_de_publicar(votaciones, stats_previas) and not forzar:
+        print("\n❌ Publicación detenida por errores de validación")
+        print("   Usa --forzar para publicar de todos modos")
+        return False
+    
+    generar_datos_para_sitio(votaciones, directorio)
+    return True
+
+
+def main(annos=None, workers=4, forzar=False, raw_dir='data/raw', site_dir='docs/data'):
+    """
+    Función principal: consulta el API y publica los datos del sitio
+    
+    Args:
+        annos (list): Años a consultar (por defecto 2001 a 2025)
+        workers (int): Consultas simultáneas al API
+        forzar (bool): Publicar aunque la validación encuentre errores
+        raw_dir (str): Directorio de los JSON por año y del archivo comprimido
+        site_dir (str): Directorio de datos del sitio
+        
+    Returns:
+        bool: True si se publicó; False si no hubo datos, la validación lo
+            impidió o hubo un error
+    """
     
     print("\n" + "🇨🇱 " * 20)
     print("ACTUALIZADOR DE DATOS - SEGUIMIENTO LEGISLATIVO CHILE")
     print("🇨🇱 " * 20 + "\n")
     
     # Años a consultar: desde 2001 hasta 2025
-    annos_a_consultar = list(range(2001, 2026))  # 2001 a 2025
+    annos_a_consultar = list(annos) if annos is not None else list(range(2001, 2026))
+    if not annos_a_consultar:
+        print("✗ No hay años que consultar")
+        return False
     
     print(f"📅 Consultando años: {annos_a_consultar[0]} - {annos_a_consultar[-1]}")
     print(f"   Total de años: {len(annos_a_consultar)}")
     print("\n⚠️  NOTA: Esto puede tomar varios minutos...")
-    print("   El API procesará 25 años de datos.\n")
+    print(f"   El API procesará {len(annos_a_consultar)} años de datos.\n")
     
     try:
         # 1. Obtener datos del API
-        votaciones = actualizar_datos_votaciones(annos_a_consultar)
+        votaciones_nuevas = actualizar_datos_votaciones(annos_a_consultar, workers=workers,
+                                                        output_dir=raw_dir)
         
         # 2. Explorar estructura
-        if votaciones:
-            explorar_estructura_datos(votaciones)
+        if votaciones_nuevas:
+            explorar_estructura_datos(votaciones_nuevas)
+            
+            # Los años consultados ya quedaron en raw_dir; se publican junto
+            # con los demás años descargados antes, como en 'export'
+            votaciones = cargar_votaciones_raw(raw_dir)
+            print(f"\n📦 Corpus a publicar: {len(votaciones):,} votaciones "
+                  f"({len(votaciones_nuevas):,} recién consultadas)")
             
-            # 3. Generar archivos para sitio web
-            generar_datos_para_sitio(votaciones)
+            # 3. Validar y generar archivos para sitio web
+            if not publicar(votaciones, forzar=forzar, directorio=site_dir):
+                return False
             
             print("\n" + "="*70)
             print("✅ PROCESO COMPLETADO EXITOSAMENTE")
             print("="*70)
             print("\nPróximos pasos:")
-            print("1. Revisa los archivos generados en data/")
-            print("2. Verifica docs/data/votaciones.json")
+            print(f"1. Revisa los archivos generados en {raw_dir}/")
+            print(f"2. Verifica {site_dir}/votaciones.json")
             print("3. Haz commit de los cambios en GitHub Desktop")
             print("4. Push para actualizar el sitio web")
+            return True
         else:
             print("\n" + "="*70)
             print("⚠️  NO SE OBTUVIERON DATOS")
@@ -265,12 +463,14 @@ def main():
             print("- El API podría estar caído")
             print("- Los años consultados no tienen datos")
             print("- Error de conexión a Internet")
+            return False
             
     except Exception as e:
         print(f"\n❌ ERROR FATAL: {e}")
         import traceback
         traceback.print_exc()
+        return False
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
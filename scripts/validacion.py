@@ -0,0 +1,190 @@
+"""
+Validación del corpus de votaciones antes de publicar
+
+Todas las reglas se evalúan columna a columna sobre el corpus completo
+(operaciones vectorizadas de pandas/NumPy), sin recorrer voto a voto.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .clasificacion import Desenlace, a_numerico, desenlace
+
+
+# Tamaño de la Cámara: 120 diputados hasta el periodo 2018-2022, 155 desde entonces
+CAMBIO_TAMANO_CAMARA = pd.Timestamp('2018-03-11')
+TAMANO_CAMARA_ANTERIOR = 120
+TAMANO_CAMARA_ACTUAL = 155
+
+CAMPOS_TOTALES = ['TotalSi', 'TotalNo', 'TotalAbstencion', 'TotalDispensado']
+
+# Máximo de Ids listados por violación en el reporte
+MAX_IDS_REPORTE = 10
+
+
+def _violacion(regla, nivel, mensaje, ids=None):
+    """Construye el registro de una violación"""
+    return {
+        'regla': regla,
+        'nivel': nivel,
+        'mensaje': mensaje,
+        'ids': list(ids) if ids is not None else []
+    }
+
+
+def validar_votaciones(votaciones, stats_previas=None, tolerancia_reduccion=0.05):
+    """
+    Valida el corpus de votaciones
+
+    Args:
+        votaciones (list|pd.DataFrame): Votaciones en formato del API
+        stats_previas (dict): stats_por_anio publicado anteriormente, para
+            detectar años que perdieron votaciones
+        tolerancia_reduccion (float): Fracción de reducción tolerada por año
+
+    Returns:
+        list: Violaciones encontradas (diccionarios con regla, nivel, mensaje e ids)
+    """
+    df = votaciones if isinstance(votaciones, pd.DataFrame) else pd.DataFrame(votaciones)
+    violaciones = []
+
+    if df.empty:
+        return [_violacion('corpus_vacio', 'error', 'No hay votaciones')]
+
+    faltantes = [c for c in ['Id', 'Fecha'] + CAMPOS_TOTALES if c not in df.columns]
+    if faltantes:
+        return [_violacion('campos_faltantes', 'error', f"Faltan campos: {faltantes}")]
+
+    ids = df['Id'].astype(str).to_numpy()
+
+    # 1. Ids duplicados
+    duplicados = df['Id'].duplicated(keep=False).to_numpy()
+    if duplicados.any():
+        ids_duplicados = pd.unique(ids[duplicados])
+        violaciones.append(_violacion(
+            'id_duplicado', 'error',
+            f"{ids_duplicados.size} Ids aparecen más de una vez",
+            ids_duplicados
+        ))
+
+    # 2. Fechas no parseables
+    fechas = pd.to_datetime(df['Fecha'], errors='coerce', format='ISO8601')
+    sin_fecha = fechas.isna().to_numpy()
+    if sin_fecha.any():
+        violaciones.append(_violacion(
+            'fecha_invalida', 'error',
+            f"{sin_fecha.sum()} votaciones con Fecha no parseable",
+            ids[sin_fecha]
+        ))
+
+    # 3. Totales no numéricos, negativos o sobre el tamaño de la Cámara
+    totales = np.column_stack([a_numerico(df[c]) for c in CAMPOS_TOTALES])
+    invalidos = np.isnan(totales).any(axis=1) | (totales < 0).any(axis=1)
+    if invalidos.any():
+        violaciones.append(_violacion(
+            'total_invalido', 'error',
+            f"{invalidos.sum()} votaciones con totales no numéricos o negativos",
+            ids[invalidos]
+        ))
+
+    tamano = np.where(
+        (fechas >= CAMBIO_TAMANO_CAMARA).to_numpy(),
+        TAMANO_CAMARA_ACTUAL,
+        TAMANO_CAMARA_ANTERIOR
+    )
+    excedidos = ~invalidos & (np.nan_to_num(totales).sum(axis=1) > tamano)
+    if excedidos.any():
+        violaciones.append(_violacion(
+            'total_excede_camara', 'error',
+            f"{excedidos.sum()} votaciones con más votos que diputados en ejercicio",
+            ids[excedidos]
+        ))
+
+    # 4. Códigos de resultado desconocidos
+    if 'Resultado_Valor' in df.columns:
+        codigos = np.nan_to_num(a_numerico(df['Resultado_Valor']), nan=-1)
+        desconocidos = desenlace(codigos) == Desenlace.DESCONOCIDO
+        if desconocidos.any():
+            violaciones.append(_violacion(
+                'resultado_desconocido', 'advertencia',
+                f"{desconocidos.sum()} votaciones con Resultado_Valor desconocido",
+                ids[desconocidos]
+            ))
+
+    # 5. Años que perdieron votaciones respecto a la publicación anterior
+    if stats_previas:
+        conteo = fechas.dt.year.value_counts()
+        for anio, previo in stats_previas.items():
+            total_previo = previo.get('total', 0)
+            total_actual = int(conteo.get(int(anio), 0))
+            if total_actual < total_previo * (1 - tolerancia_reduccion):
+                violaciones.append(_violacion(
+                    'anio_reducido', 'error',
+                    f"{anio}: {total_actual} votaciones (antes {total_previo})"
+                ))
+
+    return violaciones
+
+
+def reportar_violaciones(violaciones):
+    """
+    Imprime las violaciones encontradas
+
+    Args:
+        violaciones (list): Resultado de validar_votaciones
+
+    Returns:
+        bool: True si no hay violaciones de nivel 'error'
+    """
+    if not violaciones:
+        print("✓ Validación sin observaciones")
+        return True
+
+    for v in violaciones:
+        icono = '✗' if v['nivel'] == 'error' else '⚠️ '
+        print(f"{icono} [{v['regla']}] {v['mensaje']}")
+        if v['ids']:
+            muestra = ', '.join(v['ids'][:MAX_IDS_REPORTE])
+            resto = len(v['ids']) - MAX_IDS_REPORTE
+            print(f"    Ids: {muestra}" + (f" (+{resto} más)" if resto > 0 else ''))
+
+    return not any(v['nivel'] == 'error' for v in violaciones)
+
+
+def main():
+    """Función principal para testing: valida los datos incluidos y mide el costo a 10x"""
+    import glob
+    import json
+    import time
+
+    votaciones = []
+    for archivo in sorted(glob.glob('data/raw/votaciones_*.json')):
+        with open(archivo, 'r', encoding='utf-8') as f:
+            votaciones.extend(json.load(f))
+
+    if not votaciones:
+        print("✗ No se encontraron archivos en data/raw/")
+        return
+
+    df = pd.DataFrame(votaciones)
+    inicio = time.perf_counter()
+    violaciones = validar_votaciones(df)
+    print(f"Corpus real: {len(df):,} votaciones en {time.perf_counter() - inicio:.3f}s")
+    reportar_violaciones(violaciones)
+
+    # Corpus sintético 10x con Ids desplazados para que sigan siendo únicos
+    copias = []
+    for i in range(10):
+        copia = df.copy()
+        copia['Id'] = (pd.to_numeric(copia['Id']) + i * 1_000_000).astype(str)
+        copias.append(copia)
+    sintetico = pd.concat(copias, ignore_index=True)
+
+    inicio = time.perf_counter()
+    violaciones = validar_votaciones(sintetico)
+    print(f"\nCorpus 10x: {len(sintetico):,} votaciones en {time.perf_counter() - inicio:.3f}s")
+    reportar_violaciones(violaciones)
+
+
+if __name__ == "__main__":
+    main()